@@ -1,8 +1,11 @@
 """
 Module d'administration - Interface de configuration système
 """
-from datetime import datetime
-from flask import Blueprint, render_template, request, jsonify, session, redirect, url_for
+import functools
+import hashlib
+import json
+import time
+from flask import Blueprint, render_template, request, jsonify, session, redirect, url_for, make_response, Response
 from typing import Dict, Any, Optional
 import projetnotif as notif
 from metrics import metrics_manager
@@ -16,77 +19,257 @@ from students import students_manager, FACULTIES
 # Créer un Blueprint pour l'administration
 admin_bp = Blueprint('admin', __name__, url_prefix='/admin', template_folder='templates')
 
+# Références locales aux objets partagés de projetnotif (jamais reliés à
+# nouveau après l'import): évite une résolution d'attribut par requête
+_RETRY_CONFIG = notif.RetryConfig
+_CB_CONFIG = notif.CircuitBreakerConfig
+# PreferencesStore est un singleton: l'instancier ici une fois pour toutes
+# évite le passage par __new__/__init__ à chaque envoi
+_PREFS_STORE = notif.PreferencesStore()
+
 
 # ==================== FONCTIONS UTILITAIRES ====================
 
+# Caches mémoïsés des configurations (lues à chaque GET /api/config/* et
+# /api/status, modifiées rarement). Invalidés par les POST de mise à jour.
+_retry_cache: Optional[Dict[str, Any]] = None
+_cb_cache: Optional[Dict[str, Any]] = None
+
+
+def _invalidate_config_caches():
+    """Invalide les caches de configuration après une écriture."""
+    global _retry_cache, _cb_cache
+    _retry_cache = None
+    _cb_cache = None
+
+
 def get_retry_config() -> Dict[str, Any]:
     """Récupère la configuration actuelle du retry."""
-    config = notif.RetryConfig
-    return {
-        "attempts": config.get_option("attempts", 3),
-        "delay": config.get_option("delay", 1),
-        "backoff": config.get_option("backoff", 2),
-        "defaults": config.defaults
-    }
+    global _retry_cache
+    if _retry_cache is None:
+        config = _RETRY_CONFIG
+        _retry_cache = {
+            "attempts": config.get_option("attempts", 3),
+            "delay": config.get_option("delay", 1),
+            "backoff": config.get_option("backoff", 2),
+            "defaults": config.defaults
+        }
+    return _retry_cache
 
 
 def get_circuit_breaker_config() -> Dict[str, Any]:
     """Récupère la configuration actuelle du circuit breaker."""
-    config = notif.CircuitBreakerConfig
-    return {
-        "threshold": config.get_option("threshold", 3),
-        "cooldown": config.get_option("cooldown", 5),
-        "defaults": config.defaults
-    }
+    global _cb_cache
+    if _cb_cache is None:
+        config = _CB_CONFIG
+        _cb_cache = {
+            "threshold": config.get_option("threshold", 3),
+            "cooldown": config.get_option("cooldown", 5),
+            "defaults": config.defaults
+        }
+    return _cb_cache
 
 
 def get_system_status() -> Dict[str, Any]:
-    """Récupère le statut général du système."""
-    registry = notif.REGISTRY
-    configs = registry.get("configs", {})
-    channels = registry.get("channels", {})
-    templates = registry.get("templates", {})
-    notificateurs = registry.get("notificateurs", [])
-    
-    return {
-        "configs_actives": list(configs.keys()),
-        "canaux_disponibles": list(channels.keys()),
-        "templates_disponibles": list(templates.keys()),
-        "notificateurs_enregistres": len(notificateurs),
-        "types_notifications": [cls.__name__ for cls in registry.get("notification_types", [])]
-    }
+    """Récupère le statut général du système.
+
+    Délègue au snapshot paresseux de projetnotif: sur un système stable
+    (aucun enregistrement après l'import), c'est un simple retour de dict.
+    """
+    return notif.get_registry_snapshot()
+
+
+# Mémo de sérialisation: id(payload) -> (payload, corps JSON, ETag). Les
+# helpers ci-dessus renvoient le même objet tant que rien n'a changé, la
+# sérialisation et le hachage sont donc repliés en constantes entre deux
+# invalidations. La référence au payload garde son id() valide.
+_etag_memo: Dict[int, tuple] = {}
+
+# Enveloppes {"success": True, ...} stables: clé d'endpoint -> (objet
+# interne, enveloppe). Reconstruites seulement quand l'objet interne change.
+_wrapper_cache: Dict[str, tuple] = {}
+
+
+def _wrap_cached(key: str, field: str, inner: Dict[str, Any]) -> Dict[str, Any]:
+    """Renvoie une enveloppe {"success": True, field: inner} stable.
+
+    Tant que `inner` est le même objet (cas des helpers mémoïsés), la même
+    enveloppe est réutilisée, ce qui permet à etag_json de resservir le
+    corps déjà sérialisé.
+    """
+    cached = _wrapper_cache.get(key)
+    if cached is not None and cached[0] is inner:
+        return cached[1]
+    payload = {"success": True, field: inner}
+    _wrapper_cache[key] = (inner, payload)
+    return payload
+
+
+def etag_json(payload: Dict[str, Any], max_age: Optional[int] = None):
+    """Sérialise un payload JSON avec ETag et répond 304 si inchangé.
+
+    Les endpoints GET sont interrogés en boucle par l'interface admin ;
+    renvoyer un 304 vide quand le contenu n'a pas changé évite de
+    retransmettre le corps complet à chaque rafraîchissement.
+
+    Si ``max_age`` est fourni, la réponse porte aussi un en-tête
+    ``Cache-Control: private, max-age=N`` (et ``Vary: Cookie`` puisque le
+    contenu dépend de la session) pour que le navigateur supprime
+    entièrement les requêtes redondantes pendant N secondes.
+    """
+    memo = _etag_memo.get(id(payload))
+    if memo is not None and memo[0] is payload:
+        body, tag = memo[1], memo[2]
+    else:
+        body = json.dumps(payload, ensure_ascii=False, separators=(',', ':'))
+        tag = hashlib.blake2b(body.encode('utf-8'), digest_size=16).hexdigest()
+        if len(_etag_memo) >= 16:
+            _etag_memo.clear()
+        _etag_memo[id(payload)] = (payload, body, tag)
+    if request.if_none_match.contains(tag):
+        return '', 304
+    resp = make_response(body, 200)
+    resp.set_etag(tag)
+    resp.headers['Content-Type'] = 'application/json'
+    if max_age is not None:
+        resp.headers['Cache-Control'] = f'private, max-age={max_age}'
+        resp.headers['Vary'] = 'Cookie'
+    return resp
+
+
+def json_errors(f):
+    """Décorateur: enveloppe commune de gestion d'erreurs des endpoints API.
+
+    Tous les endpoints partageaient le même bloc try/except renvoyant
+    l'enveloppe {"success": False, "error": ...}; le centraliser ici
+    allège chaque fonction et garantit un format d'erreur uniforme.
+    """
+    @functools.wraps(f)
+    def wrapper(*args, **kwargs):
+        try:
+            return f(*args, **kwargs)
+        except ValueError as e:
+            return jsonify({
+                "success": False,
+                "error": f"Valeur invalide: {str(e)}"
+            }), 400
+        except Exception as e:
+            return jsonify({
+                "success": False,
+                "error": str(e)
+            }), 500
+    return wrapper
+
+
+@functools.lru_cache(maxsize=512)
+def _fmt(timestamp: float) -> str:
+    """Formate un timestamp en ISO 8601 (mémoïsé: les timestamps des
+    métriques ne changent qu'à l'envoi d'une notification).
+
+    Formatage manuel via time.localtime: même sortie que
+    datetime.fromtimestamp(...).isoformat(timespec='seconds') sans
+    construire d'objet datetime.
+    """
+    t = time.localtime(timestamp)
+    return '%04d-%02d-%02dT%02d:%02d:%02d' % (
+        t.tm_year, t.tm_mon, t.tm_mday, t.tm_hour, t.tm_min, t.tm_sec)
 
 
 def format_timestamp(timestamp: Optional[float]) -> Optional[str]:
     if timestamp is None:
         return None
-    return datetime.fromtimestamp(timestamp).isoformat(timespec='seconds')
+    return _fmt(timestamp)
+
+
+# Cache du résumé des métriques: (révision du collecteur, payload).
+# Exact (pas de TTL): reconstruit uniquement quand une notification a
+# réellement été enregistrée depuis le dernier poll.
+_metrics_cache: Optional[tuple] = None
 
 
 def get_metrics_summary() -> Dict[str, Any]:
+    global _metrics_cache
+    rev = metrics_manager.revision
+    if _metrics_cache is not None and _metrics_cache[0] == rev:
+        return _metrics_cache[1]
+
     summary = metrics_manager.get_summary()
 
     global_data = summary.get("global", {})
     global_data["last_notification_iso"] = format_timestamp(global_data.get("last_notification"))
 
+    # get_summary() renvoie déjà des copies: on peut les enrichir sur place
+    # au lieu de re-copier chaque dict avec {**data, ...}
+    _format = format_timestamp
     formatted_notifiers = {}
     for name, data in summary.get("notifiers", {}).items():
-        formatted_notifiers[name] = {
-            **data,
-            "success_rate": (
-                data["success"] / data["count"] if data.get("count") else None
-            ),
-            "last_timestamp_iso": format_timestamp(data.get("last_timestamp")),
-        }
+        count = data.get("count")
+        data["success_rate"] = data["success"] / count if count else None
+        data["last_timestamp_iso"] = _format(data.get("last_timestamp"))
+        formatted_notifiers[name] = data
 
-    return {
+    result = {
         "global": global_data,
         "notifiers": formatted_notifiers,
     }
+    _metrics_cache = (rev, result)
+    return result
+
+
+# Cache du payload composite de /api/status: (composants, payload). Il est
+# reconstruit dès qu'un des sous-dicts mémoïsés a été remplacé.
+_status_payload_cache: Optional[tuple] = None
+
+
+def _build_status_payload() -> Dict[str, Any]:
+    """Assemble le payload complet de /api/status en réutilisant les
+    caches des helpers, sans reconstruire le dict composite à chaque poll."""
+    global _status_payload_cache
+    components = (
+        get_system_status(),
+        get_retry_config(),
+        get_circuit_breaker_config(),
+        get_metrics_summary(),
+    )
+    if _status_payload_cache is not None and _status_payload_cache[0] == tuple(
+        id(c) for c in components
+    ):
+        return _status_payload_cache[1]
+
+    status, retry_config, cb_config, metrics_summary = components
+    payload = {
+        "success": True,
+        "status": status,
+        "retry_config": retry_config,
+        "circuit_breaker_config": cb_config,
+        "metrics": metrics_summary
+    }
+    _status_payload_cache = (tuple(id(c) for c in components), payload)
+    return payload
 
 
 # ==================== ROUTES PAGES HTML ====================
 
+# Cache du HTML rendu, par (template, username, rôle): ces pages n'ont
+# aucun contexte propre, leur seul contenu dynamique est session.user
+# affiché par base.html. Le rendu Jinja n'est donc exécuté qu'une fois
+# par couple page/utilisateur.
+_page_cache: Dict[tuple, str] = {}
+
+
+def _render_page(template: str) -> str:
+    """Rend une page admin sans contexte, mémoïsée par utilisateur."""
+    user = session.get('user') or {}
+    key = (template, user.get('username'), user.get('role'))
+    html = _page_cache.get(key)
+    if html is None:
+        if len(_page_cache) >= 64:
+            _page_cache.clear()
+        html = render_template(template)
+        _page_cache[key] = html
+    return html
+
+
 @admin_bp.route('/login', methods=['GET', 'POST'])
 def login():
     """Page de connexion."""
@@ -125,7 +308,7 @@ def logout():
 @require_auth
 def index():
     """Page d'accueil de l'interface d'administration."""
-    return render_template('admin/index.html')
+    return _render_page('admin/index.html')
 
 
 @admin_bp.route('/config/retry')
@@ -133,7 +316,7 @@ def index():
 @require_role('admin', 'operator')
 def config_retry_page():
     """Page de configuration du retry."""
-    return render_template('admin/config_retry.html')
+    return _render_page('admin/config_retry.html')
 
 
 @admin_bp.route('/config/circuit-breaker')
@@ -141,21 +324,21 @@ def config_retry_page():
 @require_role('admin', 'operator')
 def config_circuit_breaker_page():
     """Page de configuration du circuit breaker."""
-    return render_template('admin/config_circuit_breaker.html')
+    return _render_page('admin/config_circuit_breaker.html')
 
 
 @admin_bp.route('/status')
 @require_auth
 def status_page():
     """Page de statut du système."""
-    return render_template('admin/status.html')
+    return _render_page('admin/status.html')
 
 
 @admin_bp.route('/queue')
 @require_auth
 def queue_page():
     """Page de gestion des files d'attente."""
-    return render_template('admin/queue.html')
+    return _render_page('admin/queue.html')
 
 
 @admin_bp.route('/send')
@@ -163,403 +346,398 @@ def queue_page():
 @require_role('admin', 'operator')
 def send_notification_page():
     """Page d'envoi de notification depuis l'interface."""
-    return render_template('admin/send_notification.html')
+    return _render_page('admin/send_notification.html')
 
 
 # ==================== ENDPOINTS API ====================
 
+def _erreur_json(message: str, status: int = 400) -> Response:
+    """Construit une réponse d'erreur JSON constante, prête à resservir.
+
+    Les messages de validation sont fixes: construire la Response une
+    seule fois à l'import évite dict + jsonify + Response sur le chemin
+    d'erreur (le même objet est réutilisé, jamais modifié).
+    """
+    body = json.dumps({"success": False, "error": message},
+                      ensure_ascii=False, separators=(',', ':'))
+    return Response(body, status=status, mimetype='application/json')
+
+
+# Tables de validation des configurations: champ -> (conversion, borne
+# inférieure, réponse d'erreur préconstruite). Piloter la validation par
+# les données évite de dupliquer la cascade de if/int()/float() dans
+# chaque endpoint.
+_RETRY_SPEC = {
+    "attempts": (int, 1, _erreur_json("Le nombre de tentatives doit être >= 1")),
+    "delay": (float, 0, _erreur_json("Le délai doit être >= 0")),
+    "backoff": (float, 1, _erreur_json("Le facteur de backoff doit être >= 1")),
+}
+
+_CB_SPEC = {
+    "threshold": (int, 1, _erreur_json("Le seuil doit être >= 1")),
+    "cooldown": (float, 0, _erreur_json("Le temps de cooldown doit être >= 0")),
+}
+
+# Réponse partagée des POST sans corps JSON valide
+_ERR_NOT_JSON = _erreur_json("Le contenu doit être au format JSON")
+
+
+def _appliquer_spec(config, data: Dict[str, Any], spec: Dict[str, tuple]):
+    """Valide et applique les champs de `data` décrits par `spec`.
+
+    Retourne la réponse d'erreur de la première valeur hors bornes,
+    ou None si tout a été appliqué.
+
+    Deux passes: tous les champs sont convertis et bornés avant le
+    premier set_option. Un 400 (ou une conversion qui lève) laisse donc
+    la config intacte — sinon les champs déjà appliqués divergeraient
+    des caches, invalidés seulement après un succès complet.
+    """
+    valides = []
+    for key, (cast, minimum, erreur) in spec.items():
+        if key in data:
+            value = cast(data[key])
+            if value < minimum:
+                return erreur
+            valides.append((key, value))
+    for key, value in valides:
+        config.set_option(key, value)
+    return None
+
 @admin_bp.route('/api/config/retry', methods=['GET'])
 @require_auth
+@json_errors
 def get_retry_config_api():
     """API: Récupère la configuration du retry."""
-    try:
-        config = get_retry_config()
-        return jsonify({
-            "success": True,
-            "config": config
-        }), 200
-    except Exception as e:
-        return jsonify({
-            "success": False,
-            "error": str(e)
-        }), 500
+    return etag_json(_wrap_cached("retry", "config", get_retry_config()))
 
 
 @admin_bp.route('/api/config/retry', methods=['POST'])
 @require_auth
 @require_role('admin', 'operator')
+@json_errors
 def update_retry_config_api():
     """API: Met à jour la configuration du retry."""
-    try:
-        if not request.is_json:
-            return jsonify({
-                "success": False,
-                "error": "Le contenu doit être au format JSON"
-            }), 400
-        
-        data = request.get_json()
-        config = notif.RetryConfig
-        
-        # Validation et mise à jour
-        if "attempts" in data:
-            attempts = int(data["attempts"])
-            if attempts < 1:
-                return jsonify({
-                    "success": False,
-                    "error": "Le nombre de tentatives doit être >= 1"
-                }), 400
-            config.set_option("attempts", attempts)
-        
-        if "delay" in data:
-            delay = float(data["delay"])
-            if delay < 0:
-                return jsonify({
-                    "success": False,
-                    "error": "Le délai doit être >= 0"
-                }), 400
-            config.set_option("delay", delay)
-        
-        if "backoff" in data:
-            backoff = float(data["backoff"])
-            if backoff < 1:
-                return jsonify({
-                    "success": False,
-                    "error": "Le facteur de backoff doit être >= 1"
-                }), 400
-            config.set_option("backoff", backoff)
-        
-        return jsonify({
-            "success": True,
-            "message": "Configuration retry mise à jour avec succès",
-            "config": get_retry_config()
-        }), 200
-        
-    except ValueError as e:
-        return jsonify({
-            "success": False,
-            "error": f"Valeur invalide: {str(e)}"
-        }), 400
-    except Exception as e:
-        return jsonify({
-            "success": False,
-            "error": str(e)
-        }), 500
+    # Un seul appel: get_json(silent=True) renvoie None si le
+    # Content-Type n'est pas JSON ou si le corps est invalide
+    data = request.get_json(silent=True)
+    if data is None:
+        return _ERR_NOT_JSON
+
+    config = _RETRY_CONFIG
+
+    # Validation et mise à jour
+    erreur = _appliquer_spec(config, data, _RETRY_SPEC)
+    if erreur is not None:
+        return erreur
+
+    _invalidate_config_caches()
+    return jsonify({
+        "success": True,
+        "message": "Configuration retry mise à jour avec succès",
+        "config": get_retry_config()
+    }), 200
 
 
 @admin_bp.route('/api/config/retry/reset', methods=['POST'])
 @require_auth
 @require_role('admin')
+@json_errors
 def reset_retry_config_api():
     """API: Réinitialise la configuration du retry aux valeurs par défaut."""
-    try:
-        config = notif.RetryConfig
-        
-        # Réinitialiser aux valeurs par défaut
-        for key, default_value in config.defaults.items():
-            config.set_option(key, default_value)
-        
-        return jsonify({
-            "success": True,
-            "message": "Configuration retry réinitialisée aux valeurs par défaut",
-            "config": get_retry_config()
-        }), 200
-        
-    except Exception as e:
-        return jsonify({
-            "success": False,
-            "error": str(e)
-        }), 500
+    config = _RETRY_CONFIG
+
+    # Réinitialiser aux valeurs par défaut
+    config.set_options(config.defaults)
+
+    _invalidate_config_caches()
+    return jsonify({
+        "success": True,
+        "message": "Configuration retry réinitialisée aux valeurs par défaut",
+        "config": get_retry_config()
+    }), 200
 
 
 @admin_bp.route('/api/config/circuit-breaker', methods=['GET'])
 @require_auth
+@json_errors
 def get_circuit_breaker_config_api():
     """API: Récupère la configuration du circuit breaker."""
-    try:
-        config = get_circuit_breaker_config()
-        return jsonify({
-            "success": True,
-            "config": config
-        }), 200
-    except Exception as e:
-        return jsonify({
-            "success": False,
-            "error": str(e)
-        }), 500
+    return etag_json(_wrap_cached("circuit_breaker", "config",
+                                  get_circuit_breaker_config()))
 
 
 @admin_bp.route('/api/config/circuit-breaker', methods=['POST'])
 @require_auth
 @require_role('admin', 'operator')
+@json_errors
 def update_circuit_breaker_config_api():
     """API: Met à jour la configuration du circuit breaker."""
-    try:
-        if not request.is_json:
-            return jsonify({
-                "success": False,
-                "error": "Le contenu doit être au format JSON"
-            }), 400
-        
-        data = request.get_json()
-        config = notif.CircuitBreakerConfig
-        
-        # Validation et mise à jour
-        if "threshold" in data:
-            threshold = int(data["threshold"])
-            if threshold < 1:
-                return jsonify({
-                    "success": False,
-                    "error": "Le seuil doit être >= 1"
-                }), 400
-            config.set_option("threshold", threshold)
-        
-        if "cooldown" in data:
-            cooldown = float(data["cooldown"])
-            if cooldown < 0:
-                return jsonify({
-                    "success": False,
-                    "error": "Le temps de cooldown doit être >= 0"
-                }), 400
-            config.set_option("cooldown", cooldown)
-        
-        return jsonify({
-            "success": True,
-            "message": "Configuration circuit breaker mise à jour avec succès",
-            "config": get_circuit_breaker_config()
-        }), 200
-        
-    except ValueError as e:
-        return jsonify({
-            "success": False,
-            "error": f"Valeur invalide: {str(e)}"
-        }), 400
-    except Exception as e:
-        return jsonify({
-            "success": False,
-            "error": str(e)
-        }), 500
+    data = request.get_json(silent=True)
+    if data is None:
+        return _ERR_NOT_JSON
+
+    config = _CB_CONFIG
+
+    # Validation et mise à jour
+    erreur = _appliquer_spec(config, data, _CB_SPEC)
+    if erreur is not None:
+        return erreur
+
+    _invalidate_config_caches()
+    return jsonify({
+        "success": True,
+        "message": "Configuration circuit breaker mise à jour avec succès",
+        "config": get_circuit_breaker_config()
+    }), 200
 
 
 @admin_bp.route('/api/config/circuit-breaker/reset', methods=['POST'])
 @require_auth
 @require_role('admin')
+@json_errors
 def reset_circuit_breaker_config_api():
     """API: Réinitialise la configuration du circuit breaker aux valeurs par défaut."""
-    try:
-        config = notif.CircuitBreakerConfig
-        
-        # Réinitialiser aux valeurs par défaut
-        for key, default_value in config.defaults.items():
-            config.set_option(key, default_value)
-        
-        return jsonify({
-            "success": True,
-            "message": "Configuration circuit breaker réinitialisée aux valeurs par défaut",
-            "config": get_circuit_breaker_config()
-        }), 200
-        
-    except Exception as e:
-        return jsonify({
-            "success": False,
-            "error": str(e)
-        }), 500
+    config = _CB_CONFIG
+
+    # Réinitialiser aux valeurs par défaut
+    config.set_options(config.defaults)
+
+    _invalidate_config_caches()
+    return jsonify({
+        "success": True,
+        "message": "Configuration circuit breaker réinitialisée aux valeurs par défaut",
+        "config": get_circuit_breaker_config()
+    }), 200
 
 
 @admin_bp.route('/api/status', methods=['GET'])
 @require_auth
+@json_errors
 def get_system_status_api():
     """API: Récupère le statut général du système."""
-    try:
-        status = get_system_status()
-        retry_config = get_retry_config()
-        cb_config = get_circuit_breaker_config()
-        metrics_summary = get_metrics_summary()
-
-        return jsonify({
-            "success": True,
-            "status": status,
-            "retry_config": retry_config,
-            "circuit_breaker_config": cb_config,
-            "metrics": metrics_summary
-        }), 200
-        
-    except Exception as e:
-        return jsonify({
-            "success": False,
-            "error": str(e)
-        }), 500
+    # Budget de fraîcheur de 5 s: le tableau de bord rafraîchit en boucle,
+    # inutile de recalculer le statut plus souvent que ça.
+    return etag_json(_build_status_payload(), max_age=5)
 
 
 @admin_bp.route('/api/metrics', methods=['GET'])
 @require_auth
+@json_errors
 def get_metrics_api():
     """API: Récupère les métriques de performance."""
-    try:
-        metrics_summary = get_metrics_summary()
-        return jsonify({
-            "success": True,
-            "metrics": metrics_summary
-        }), 200
-    except Exception as e:
-        return jsonify({
-            "success": False,
-            "error": str(e)
-        }), 500
+    # Même budget de fraîcheur de 5 s que /api/status.
+    return etag_json(_wrap_cached("metrics", "metrics", get_metrics_summary()),
+                     max_age=5)
 
 
 # ==================== GESTION DES UTILISATEURS ====================
 
+# ROLES est statique: la projection des descriptions est construite une
+# seule fois à l'import
+_ROLES_DESC = {role: data["description"] for role, data in ROLES.items()}
+
+# Projection "sans mots de passe" mémoïsée: (dict source, projection).
+# load_users() renvoie le même objet tant que la table n'a pas changé.
+_safe_users_cache: Optional[tuple] = None
+
+
+def _get_safe_users(users: Dict[str, Dict]) -> Dict[str, Dict]:
+    """Projette les utilisateurs sans exposer les mots de passe."""
+    global _safe_users_cache
+    if _safe_users_cache is not None and _safe_users_cache[0] is users:
+        return _safe_users_cache[1]
+
+    safe_users = {
+        username: {
+            "username": user.get("username"),
+            "role": user.get("role"),
+            "active": user.get("active", True),
+            "has_api_key": bool(user.get("api_key"))
+        }
+        for username, user in users.items()
+    }
+    _safe_users_cache = (users, safe_users)
+    return safe_users
+
+
 @admin_bp.route('/api/users', methods=['GET'])
 @require_auth
 @require_role('admin')
+@json_errors
 def list_users_api():
     """API: Liste tous les utilisateurs (admin uniquement)."""
-    try:
-        users = load_users()
-        # Ne pas exposer les mots de passe
-        safe_users = {}
-        for username, user in users.items():
-            safe_users[username] = {
-                "username": user.get("username"),
-                "role": user.get("role"),
-                "active": user.get("active", True),
-                "has_api_key": bool(user.get("api_key"))
-            }
-        
-        return jsonify({
-            "success": True,
-            "users": safe_users,
-            "roles": {role: data["description"] for role, data in ROLES.items()}
-        }), 200
-    except Exception as e:
-        return jsonify({
-            "success": False,
-            "error": str(e)
-        }), 500
+    safe_users = _get_safe_users(load_users())
+
+    return jsonify({
+        "success": True,
+        "users": safe_users,
+        "roles": _ROLES_DESC
+    }), 200
 
 
 @admin_bp.route('/api/users', methods=['POST'])
 @require_auth
 @require_role('admin')
+@json_errors
 def create_user_api():
     """API: Crée un nouvel utilisateur (admin uniquement)."""
+    data = request.get_json(silent=True)
+    if data is None:
+        return _ERR_NOT_JSON
+
+    username = data.get("username")
+    password = data.get("password")
+    role = data.get("role", "viewer")
+
+    if not username or not password:
+        return jsonify({
+            "success": False,
+            "error": "Le nom d'utilisateur et le mot de passe sont requis"
+        }), 400
+
+    # Les ValueError métier (rôle invalide, doublon) gardent leur message
+    # d'origine, sans le préfixe générique ajouté par json_errors
     try:
-        if not request.is_json:
-            return jsonify({
-                "success": False,
-                "error": "Le contenu doit être au format JSON"
-            }), 400
-        
-        data = request.get_json()
-        username = data.get("username")
-        password = data.get("password")
-        role = data.get("role", "viewer")
-        
-        if not username or not password:
-            return jsonify({
-                "success": False,
-                "error": "Le nom d'utilisateur et le mot de passe sont requis"
-            }), 400
-        
         user = create_user(username, password, role)
-        
-        return jsonify({
-            "success": True,
-            "message": f"Utilisateur '{username}' créé avec succès",
-            "user": {
-                "username": user["username"],
-                "role": user["role"],
-                "api_key": user["api_key"]
-            }
-        }), 201
-        
     except ValueError as e:
         return jsonify({
             "success": False,
             "error": str(e)
         }), 400
-    except Exception as e:
-        return jsonify({
-            "success": False,
-            "error": str(e)
-        }), 500
+
+    return jsonify({
+        "success": True,
+        "message": f"Utilisateur '{username}' créé avec succès",
+        "user": {
+            "username": user["username"],
+            "role": user["role"],
+            "api_key": user["api_key"]
+        }
+    }), 201
 
 
 # ==================== ENDPOINTS FILES D'ATTENTE ====================
 
 @admin_bp.route('/api/queue/tasks', methods=['GET'])
 @require_auth
+@json_errors
 def list_queue_tasks_api():
     """API: Liste les tâches en file d'attente."""
-    try:
-        limit = request.args.get('limit', 100, type=int)
-        tasks = queue_manager.get_all_tasks(limit=limit)
-        return jsonify({
-            "success": True,
-            "tasks": tasks
-        }), 200
-    except Exception as e:
-        return jsonify({
-            "success": False,
-            "error": str(e)
-        }), 500
+    limit = request.args.get('limit', 100, type=int)
+
+    # ETag faible dérivé du compteur de révision de la file: quand rien
+    # n'a bougé, le poll du tableau de bord coûte une comparaison d'entier
+    # au lieu d'une sérialisation complète des tâches
+    tag = f"{queue_manager.revision}-{limit}"
+    if request.if_none_match.contains_weak(tag):
+        return '', 304
+
+    tasks = queue_manager.get_all_tasks(limit=limit)
+    resp = make_response(jsonify({
+        "success": True,
+        "tasks": tasks
+    }), 200)
+    resp.set_etag(tag, weak=True)
+    resp.headers['Cache-Control'] = 'private, max-age=1'
+    return resp
 
 
 @admin_bp.route('/api/queue/stats', methods=['GET'])
 @require_auth
+@json_errors
 def get_queue_stats_api():
     """API: Récupère les statistiques de la file d'attente."""
-    try:
-        stats = queue_manager.get_stats()
-        return jsonify({
-            "success": True,
-            "stats": stats
-        }), 200
-    except Exception as e:
-        return jsonify({
-            "success": False,
-            "error": str(e)
-        }), 500
+    stats = queue_manager.get_stats()
+    return jsonify({
+        "success": True,
+        "stats": stats
+    }), 200
 
 
 @admin_bp.route('/api/queue/clear', methods=['POST'])
 @require_auth
 @require_role('admin')
+@json_errors
 def clear_completed_tasks_api():
     """API: Nettoie les tâches complétées anciennes (admin uniquement)."""
-    try:
-        hours = request.json.get('hours', 24) if request.is_json else 24
-        removed = queue_manager.clear_completed(older_than_hours=hours)
-        return jsonify({
-            "success": True,
-            "message": f"{removed} tâches supprimées",
-            "removed": removed
-        }), 200
-    except Exception as e:
-        return jsonify({
-            "success": False,
-            "error": str(e)
-        }), 500
+    hours = request.json.get('hours', 24) if request.is_json else 24
+    removed = queue_manager.clear_completed(older_than_hours=hours)
+    return jsonify({
+        "success": True,
+        "message": f"{removed} tâches supprimées",
+        "removed": removed
+    }), 200
 
 
 # ==================== ENVOI DE NOTIFICATIONS DEPUIS L'ADMIN ====================
 
+# Référence hissée pour le test isinstance dans la boucle d'envoi
+_LANGUE = notif.Langue
+
+# Taille des lots de destinataires par tâche de file d'attente
+_SEND_BATCH_SIZE = 500
+
+# Types de notification acceptés (test d'appartenance O(1))
+_VALID_TYPES = frozenset({"meteo", "securite", "sante", "infra"})
+
+# Taille maximale du corps accepté par l'endpoint d'envoi: la sélection
+# des destinataires se fait côté serveur, un corps légitime reste petit
+_MAX_SEND_BODY = 256 * 1024
+_ERR_BODY_TOO_LARGE = _erreur_json("Corps de requête trop volumineux", 413)
+
+# Cache des listes de destinataires par cohorte:
+# (facultes, promotions) -> ((version étudiants, version préférences), liste)
+_recipients_cache: Dict[tuple, tuple] = {}
+
+
+def _build_user_dict(student, prefs) -> Dict[str, Any]:
+    """Construit le dict utilisateur attendu par la file d'attente.
+
+    Les préférences enregistrées priment sur le profil étudiant pour la
+    langue, le canal préféré et le statut actif.
+    """
+    langue = student.langue
+    canal_prefere = student.canal_prefere
+    actif = student.actif
+    if prefs is not None:
+        pl = prefs.langue
+        if pl:
+            langue = pl.value if isinstance(pl, _LANGUE) else str(pl)
+        if prefs.canal_prefere:
+            canal_prefere = prefs.canal_prefere
+        actif = prefs.actif
+    return {
+        "id": student.id,
+        "nom": student.nom,
+        "email": student.email,
+        "telephone": student.telephone,
+        "langue": langue,
+        "preferences": {
+            "langue": langue,
+            "canal_prefere": canal_prefere,
+            "actif": actif
+        }
+    }
+
+
 @admin_bp.route('/api/send-notification', methods=['POST'])
 @require_auth
 @require_role('admin', 'operator')
 def send_notification_from_admin():
     """API: Envoie une notification depuis l'interface admin."""
     try:
+        # Rejeter les corps démesurés avant tout parsing JSON
+        if request.content_length is not None and request.content_length > _MAX_SEND_BODY:
+            return _ERR_BODY_TOO_LARGE
+
         if not request.is_json:
-            return jsonify({
-                "success": False,
-                "error": "Le contenu doit être au format JSON"
-            }), 400
-        
+            return _ERR_NOT_JSON
+
         data = request.get_json()
         notification_type = data.get("type")
-        
-        if notification_type not in ["meteo", "securite", "sante", "infra"]:
+
+        if notification_type not in _VALID_TYPES:
             return jsonify({
                 "success": False,
                 "error": f"Type de notification invalide: {notification_type}"
@@ -568,69 +746,59 @@ def send_notification_from_admin():
         # Récupérer les destinataires par filtrage
         facultes = data.get("facultes", [])
         promotions = data.get("promotions", [])
-        
-        # Filtrer selon les facultés et promotions
-        # Si aucune sélection, prendre tous les étudiants actifs
-        filtered_students = students_manager.filter_students(
-            facultes=facultes if facultes else None,
-            promotions=promotions if promotions else None,
-            actif_only=True
-        )
-        
-        # Convertir les étudiants en format utilisateur
-        # Charger le store de préférences pour récupérer les préférences de langue
-        # (maintenant un singleton, donc partagé avec app.py)
-        prefs_store = notif.PreferencesStore()
-        
-        utilisateurs_data = []
-        for student in filtered_students:
-            # Charger les préférences depuis PreferencesStore si elles existent
-            prefs = prefs_store.obtenir(student.id)
-            
-            # Déterminer la langue (préférence > profil étudiant)
-            langue = student.langue
-            if prefs and prefs.langue:
-                langue = prefs.langue.value if isinstance(prefs.langue, notif.Langue) else str(prefs.langue)
-            
-            # Déterminer le canal préféré (préférence > profil étudiant)
-            canal_prefere = student.canal_prefere
-            if prefs and prefs.canal_prefere:
-                canal_prefere = prefs.canal_prefere
-            
-            # Déterminer le statut actif (préférence > profil étudiant)
-            actif = student.actif
-            if prefs is not None:
-                actif = prefs.actif
-            
-            utilisateurs_data.append({
-                "id": student.id,
-                "nom": student.nom,
-                "email": student.email,
-                "telephone": student.telephone,
-                "langue": langue,
-                "preferences": {
-                    "langue": langue,
-                    "canal_prefere": canal_prefere,
-                    "actif": actif
-                }
-            })
-        
+
+        # Les diffusions périodiques ciblent souvent la même cohorte: la
+        # liste construite est réutilisée tant que ni les étudiants ni les
+        # préférences n'ont changé (compteurs de version)
+        cache_key = (tuple(sorted(facultes)), tuple(sorted(promotions)))
+        versions = (students_manager.version, _PREFS_STORE.version)
+        cached = _recipients_cache.get(cache_key)
+        if cached is not None and cached[0] == versions:
+            utilisateurs_data = cached[1]
+        else:
+            # Filtrer selon les facultés et promotions
+            # Si aucune sélection, prendre tous les étudiants actifs
+            filtered_students = students_manager.filter_students(
+                facultes=facultes if facultes else None,
+                promotions=promotions if promotions else None,
+                actif_only=True
+            )
+
+            # Convertir les étudiants en format utilisateur
+            # Charger en une seule passe les préférences de tous les
+            # destinataires (le store est un singleton, partagé avec app.py)
+            prefs_par_id = _PREFS_STORE.obtenir_plusieurs(
+                s.id for s in filtered_students)
+
+            _get_prefs = prefs_par_id.get
+            utilisateurs_data = [
+                _build_user_dict(student, _get_prefs(student.id))
+                for student in filtered_students
+            ]
+            if len(_recipients_cache) >= 32:
+                _recipients_cache.clear()
+            _recipients_cache[cache_key] = (versions, utilisateurs_data)
+
         if not utilisateurs_data:
             return jsonify({
                 "success": False,
                 "error": "Aucun destinataire trouvé avec les critères sélectionnés"
             }), 400
         
-        # Mettre à jour les données avec les utilisateurs filtrés
-        data["utilisateurs"] = utilisateurs_data
-        
-        # Ajouter à la file d'attente
-        task_id = queue_manager.enqueue(notification_type, data)
-        
+        # Ajouter à la file d'attente par lots: un envoi à toute
+        # l'université produirait sinon une tâche unique de dizaines de
+        # milliers de destinataires gardée entière en mémoire
+        task_ids = []
+        for debut in range(0, len(utilisateurs_data), _SEND_BATCH_SIZE):
+            lot = utilisateurs_data[debut:debut + _SEND_BATCH_SIZE]
+            task_ids.append(queue_manager.enqueue(
+                notification_type, {**data, "utilisateurs": lot}))
+
         return jsonify({
             "success": True,
             "message": f"Notification {notification_type} mise en file d'attente pour {len(utilisateurs_data)} destinataire(s)",
-            "task_id": task_id,
+            "task_id": task_ids[0],
+            "task_ids": task_ids,
             "status": "pending",
             "destinataires_count": len(utilisateurs_data)
         }), 202
@@ -649,15 +817,20 @@ def send_notification_from_admin():
         }), 500
 
 
+# FACULTIES est une constante de module: la réponse complète est
+# sérialisée une seule fois à l'import
+_FACULTIES_BODY = json.dumps({
+    "success": True,
+    "faculties": list(FACULTIES.keys()),
+    "faculties_details": FACULTIES
+}, ensure_ascii=False, separators=(',', ':'))
+
+
 @admin_bp.route('/api/students/faculties', methods=['GET'])
 @require_auth
 def get_faculties_api():
     """API: Récupère la liste des facultés."""
-    return jsonify({
-        "success": True,
-        "faculties": students_manager.get_faculties(),
-        "faculties_details": FACULTIES
-    }), 200
+    return Response(_FACULTIES_BODY, mimetype='application/json')
 
 
 @admin_bp.route('/api/students/stats', methods=['GET'])
@@ -1,20 +1,30 @@
 """
 Application Flask - API RESTful pour le système de notification d'urgence
 """
+import json
+import logging
 import os
-from flask import Flask, request, jsonify, session
+from functools import lru_cache
+from flask import Flask, Response, request, jsonify, session
 from typing import Dict, List, Any, Optional
 import projetnotif as notif
 from admin import admin_bp
 from student import student_bp
 from auth import init_default_users, require_auth
-from queue_manager import queue_manager
+from queue_manager import TokenBucket, queue_manager
 from flasgger import Swagger
 
 # ==================== INITIALISATION FLASK ====================
 
+logger = logging.getLogger(__name__)
+
 app = Flask(__name__, static_folder='static', static_url_path='/static')
-app.config['JSON_AS_ASCII'] = False  # Pour supporter les caractères français
+# Sérialisation JSON: sortie compacte, sans tri des clés et en UTF-8 brut
+# (pas d'échappement \uXXXX des caractères français) pour réduire le CPU
+# et la taille des réponses de tous les jsonify()
+app.json.compact = True
+app.json.sort_keys = False
+app.json.ensure_ascii = False
 
 # Charger SECRET_KEY depuis les variables d'environnement ou utiliser une valeur par défaut
 app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'dev-secret-key-change-in-production')
@@ -88,6 +98,34 @@ swagger_template = {
 
 swagger = Swagger(app, config=swagger_config, template=swagger_template)
 
+
+def _cacher_apispec(vue_originale):
+    """Mémorise la spec OpenAPI sérialisée après le premier calcul.
+
+    Flasgger reconstruit la spec à chaque requête sur /api/apispec.json
+    en parcourant toutes les routes et leurs docstrings; les routes
+    n'évoluant pas après le démarrage, les octets de la première réponse
+    sont resservis tels quels (sauf en mode debug, où le rechargement de
+    code doit rester visible dans la documentation).
+    """
+    cache = {}
+
+    def vue_cachee(*args, **kwargs):
+        if app.debug:
+            return vue_originale(*args, **kwargs)
+        corps = cache.get("corps")
+        if corps is None:
+            reponse = app.make_response(vue_originale(*args, **kwargs))
+            corps = cache["corps"] = reponse.get_data()
+            return reponse
+        return Response(corps, mimetype="application/json")
+
+    return vue_cachee
+
+
+app.view_functions["flasgger.apispec"] = _cacher_apispec(
+    app.view_functions["flasgger.apispec"])
+
 # Schéma réutilisable pour les notifications
 NOTIFICATION_SCHEMA = {
     "type": "object",
@@ -139,140 +177,221 @@ NOTIFICATION_SCHEMA = {
 # Créer le store de préférences (singleton)
 prefs_store = notif.PreferencesStore()
 
-# Créer les canaux de notification
-canaux = {
-    "email": notif.Email(),
-    "sms": notif.SMS(),
-    "app": notif.App(),
-}
+# Les canaux et notificateurs ne servent qu'aux workers de la file:
+# les construire à la première tâche traitée plutôt qu'au boot évite de
+# payer leur initialisation dans chaque worker gunicorn qui ne fait que
+# répondre aux requêtes HTTP (démarrage à froid plus court)
+@lru_cache(maxsize=None)
+def _get_notificateurs() -> Dict[str, "notif.NotificationBase"]:
+    """Construit (une seule fois) les canaux puis les notificateurs."""
+    canaux = {
+        "email": notif.Email(),
+        "sms": notif.SMS(),
+        "app": notif.App(),
+    }
+    return {
+        "meteo": notif.NotificationMeteorologique(canaux, prefs_store),
+        "securite": notif.NotificationSecurite(canaux, prefs_store),
+        "sante": notif.NotificationSante(canaux, prefs_store),
+        "infra": notif.NotificationInfra(canaux, prefs_store),
+    }
+
+
+# ==================== VALIDATION ET UTILITAIRES ====================
 
-# Créer les instances de notificateurs (une par type)
-notificateurs = {
-    "meteo": notif.NotificationMeteorologique(canaux, prefs_store),
-    "securite": notif.NotificationSecurite(canaux, prefs_store),
-    "sante": notif.NotificationSante(canaux, prefs_store),
-    "infra": notif.NotificationInfra(canaux, prefs_store),
+# Membres d'énumération liés une seule fois: évite les chaînes
+# d'attributs notif.Priorite.X / notif.Langue.X (deux lookups chacune)
+# sur le chemin chaud et pour les valeurs par défaut
+_P_CRITIQUE = notif.Priorite.CRITIQUE
+_P_HAUTE = notif.Priorite.HAUTE
+_P_NORMALE = notif.Priorite.NORMALE
+_L_FR = notif.Langue.FR
+_L_EN = notif.Langue.EN
+
+# Tables de correspondance construites une seule fois à l'import: les
+# validateurs sont appelés sur le chemin chaud (valider_langue une fois
+# par utilisateur) et reconstruisaient ces dicts à chaque appel
+_PRIORITE_MAP = {
+    "CRITIQUE": _P_CRITIQUE,
+    "critique": _P_CRITIQUE,
+    "1": _P_CRITIQUE,
+    "HAUTE": _P_HAUTE,
+    "haute": _P_HAUTE,
+    "2": _P_HAUTE,
+    "NORMALE": _P_NORMALE,
+    "normale": _P_NORMALE,
+    "3": _P_NORMALE,
 }
 
+_LANGUE_MAP = {
+    "fr": _L_FR,
+    "FR": _L_FR,
+    "en": _L_EN,
+    "EN": _L_EN,
+}
 
-# ==================== VALIDATION ET UTILITAIRES ====================
 
 def valider_priorite(priorite_str: str) -> notif.Priorite:
     """Convertit une chaîne de priorité en énumération Priorite."""
-    mapping = {
-        "CRITIQUE": notif.Priorite.CRITIQUE,
-        "critique": notif.Priorite.CRITIQUE,
-        "1": notif.Priorite.CRITIQUE,
-        "HAUTE": notif.Priorite.HAUTE,
-        "haute": notif.Priorite.HAUTE,
-        "2": notif.Priorite.HAUTE,
-        "NORMALE": notif.Priorite.NORMALE,
-        "normale": notif.Priorite.NORMALE,
-        "3": notif.Priorite.NORMALE,
-    }
-    if priorite_str in mapping:
-        return mapping[priorite_str]
-    raise ValueError(f"Priorité invalide: {priorite_str}. Valeurs acceptées: CRITIQUE, HAUTE, NORMALE")
+    try:
+        return _PRIORITE_MAP[priorite_str]
+    except (KeyError, TypeError):
+        raise ValueError(f"Priorité invalide: {priorite_str}. Valeurs acceptées: CRITIQUE, HAUTE, NORMALE")
 
 
 def valider_langue(langue_str: str) -> notif.Langue:
     """Convertit une chaîne de langue en énumération Langue."""
-    mapping = {
-        "fr": notif.Langue.FR,
-        "FR": notif.Langue.FR,
-        "en": notif.Langue.EN,
-        "EN": notif.Langue.EN,
-    }
-    if langue_str in mapping:
-        return mapping[langue_str]
-    raise ValueError(f"Langue invalide: {langue_str}. Valeurs acceptées: fr, en")
+    try:
+        return _LANGUE_MAP[langue_str]
+    except (KeyError, TypeError):
+        raise ValueError(f"Langue invalide: {langue_str}. Valeurs acceptées: fr, en")
+
+
+@lru_cache(maxsize=4096)
+def _construire_utilisateur(
+    user_id: str,
+    nom: str,
+    email: str,
+    langue: notif.Langue,
+    telephone: Optional[str],
+) -> notif.Utilisateur:
+    """Mémo d'identité des utilisateurs: l'effectif d'un campus est
+    stable, le même étudiant revient donc de requête en requête avec
+    les mêmes champs. Réutiliser l'instance évite de repasser par
+    __init__ et les descripteurs de validation (email, téléphone)."""
+    return notif.Utilisateur(
+        id=user_id,
+        nom=nom,
+        email=email,
+        langue=langue,
+        telephone=telephone
+    )
 
 
 def creer_utilisateurs_depuis_json(users_data: List[Dict[str, Any]]) -> List[notif.Utilisateur]:
     """Crée une liste d'objets Utilisateur à partir de données JSON."""
-    utilisateurs = []
+    # Pré-liaison des noms chauds en variables locales: dans la boucle,
+    # un LOAD_FAST remplace un accès global + attribut par itération
+    construire = _construire_utilisateur
+    Preferences = notif.Preferences
+
+    # Dédoublonner par id (listes de promotions fusionnées côté client):
+    # la dernière occurrence l'emporte, et chaque utilisateur n'est
+    # notifié — et ses préférences écrites — qu'une seule fois
+    dedup = {user_data.get("id"): user_data for user_data in users_data}
+    if len(dedup) != len(users_data):
+        logger.info("%d utilisateur(s) en double ignoré(s) dans la requête",
+                    len(users_data) - len(dedup))
+        users_data = dedup.values()
+
+    # Première passe: valider chaque entrée et en extraire les champs
+    extraits = []
     for user_data in users_data:
-        # Validation des champs requis
-        if "id" not in user_data or "nom" not in user_data or "email" not in user_data:
+        # Un seul accès par champ: .get() renvoie None si absent, ce qui
+        # remplace les paires test `in` + indexation (double parcours du
+        # dict pour chaque champ de chaque utilisateur)
+        user_id = user_data.get("id")
+        nom = user_data.get("nom")
+        email = user_data.get("email")
+        if user_id is None or nom is None or email is None:
             raise ValueError("Chaque utilisateur doit avoir: id, nom, email")
-        
-        # Récupération des champs
-        user_id = user_data["id"]
-        nom = user_data["nom"]
-        email = user_data["email"]
-        
-        # Langue (optionnel, défaut: FR)
-        langue_str = user_data.get("langue", "fr")
-        langue = valider_langue(langue_str)
-        
+
+        # Langue (optionnel, défaut: FR sans passer par le validateur)
+        langue_str = user_data.get("langue")
+        langue = _L_FR if langue_str is None else valider_langue(langue_str)
+
         # Téléphone (optionnel)
-        telephone = user_data.get("telephone", None)
-        
-        # Créer l'utilisateur
-        utilisateur = notif.Utilisateur(
-            id=user_id,
-            nom=nom,
-            email=email,
-            langue=langue,
-            telephone=telephone
-        )
-        utilisateurs.append(utilisateur)
-        
-        # Charger les préférences depuis PreferencesStore en premier
-        prefs_existantes = prefs_store.obtenir(user_id)
-        print(f"[DEBUG] creer_utilisateurs_depuis_json - User {user_id}: préférences existantes = {prefs_existantes}")
-        
+        telephone = user_data.get("telephone")
+
+        # Sous-dictionnaire des préférences, lu une seule fois
+        prefs_json = user_data.get("preferences") or {}
+        extraits.append((user_id, nom, email, langue, telephone, prefs_json))
+
+    # Un seul aller-retour vers le store pour toutes les préférences
+    # existantes au lieu d'un obtenir() par utilisateur
+    prefs_existantes_map = prefs_store.obtenir_plusieurs(
+        [extrait[0] for extrait in extraits]
+    )
+
+    utilisateurs = []
+    ajouter = utilisateurs.append
+    nouvelles_prefs = {}
+    # Garde évaluée une seule fois: en production (DEBUG désactivé) la
+    # boucle ne paie ni le formatage ni l'appel au logger, alors que les
+    # print() précédents sérialisaient chaque ligne sur stdout
+    debug_actif = logger.isEnabledFor(logging.DEBUG)
+    for user_id, nom, email, langue, telephone, prefs_json in extraits:
+        # Créer (ou réutiliser) l'utilisateur
+        ajouter(construire(user_id, nom, email, langue, telephone))
+
+        prefs_existantes = prefs_existantes_map.get(user_id)
+        if debug_actif:
+            logger.debug("creer_utilisateurs_depuis_json - User %s: préférences existantes = %s",
+                         user_id, prefs_existantes)
+
         # Déterminer la langue pour les préférences (préférence existante > JSON > langue utilisateur)
-        langue_pref = None
+        langue_json = prefs_json.get("langue")
         if prefs_existantes and prefs_existantes.langue:
             langue_pref = prefs_existantes.langue
-            print(f"[DEBUG] Langue depuis préférences existantes: {langue_pref.value if hasattr(langue_pref, 'value') else langue_pref}")
-        elif "preferences" in user_data and "langue" in user_data["preferences"]:
-            langue_pref = valider_langue(user_data["preferences"]["langue"])
-            print(f"[DEBUG] Langue depuis JSON: {langue_pref.value if hasattr(langue_pref, 'value') else langue_pref}")
+            if debug_actif:
+                logger.debug("Langue depuis préférences existantes: %s",
+                             getattr(langue_pref, 'value', langue_pref))
+        elif langue_json is not None:
+            langue_pref = valider_langue(langue_json)
+            if debug_actif:
+                logger.debug("Langue depuis JSON: %s", getattr(langue_pref, 'value', langue_pref))
         else:
             langue_pref = langue
-            print(f"[DEBUG] Langue depuis utilisateur: {langue_pref.value if hasattr(langue_pref, 'value') else langue_pref}")
-        
+            if debug_actif:
+                logger.debug("Langue depuis utilisateur: %s", getattr(langue_pref, 'value', langue_pref))
+
         # Déterminer le canal préféré (préférence existante > JSON > défaut)
-        canal_prefere = "email"
         if prefs_existantes and prefs_existantes.canal_prefere:
             canal_prefere = prefs_existantes.canal_prefere
-        elif "preferences" in user_data and "canal_prefere" in user_data["preferences"]:
-            canal_prefere = user_data["preferences"]["canal_prefere"]
-        
+        else:
+            canal_prefere = prefs_json.get("canal_prefere", "email")
+
         # Déterminer le statut actif (préférence existante > JSON > défaut)
-        actif = True
         if prefs_existantes is not None:
             actif = prefs_existantes.actif
-        elif "preferences" in user_data and "actif" in user_data["preferences"]:
-            actif = user_data["preferences"]["actif"]
+        else:
+            actif = prefs_json.get("actif", True)
         
+        # Ne réécrire que si quelque chose change réellement: une
+        # resoumission du même effectif ne doit pas incrémenter la
+        # version du store ni invalider les caches qui en dépendent
+        if (prefs_existantes is not None
+                and prefs_existantes.langue == langue_pref
+                and prefs_existantes.canal_prefere == canal_prefere
+                and prefs_existantes.actif == actif):
+            continue
+
         # Créer ou mettre à jour les préférences avec la langue
-        prefs = notif.Preferences(
+        nouvelles_prefs[user_id] = Preferences(
             langue=langue_pref,
             canal_prefere=canal_prefere,
             actif=actif
         )
-        prefs_store.sauvegarder(user_id, prefs)
-    
+
+    # Une seule écriture groupée (et une seule invalidation de version)
+    prefs_store.sauvegarder_plusieurs(nouvelles_prefs)
+
     return utilisateurs
 
 
 def creer_urgence_depuis_json(type_urgence: notif.TypeUrgence, data: Dict[str, Any]) -> notif.Urgence:
     """Crée un objet Urgence à partir de données JSON."""
-    # Validation des champs requis
-    if "titre" not in data:
+    # Un seul accès par champ (pas de test `in` suivi d'une indexation)
+    titre = data.get("titre")
+    if titre is None:
         raise ValueError("Le champ 'titre' est requis")
-    if "message" not in data:
+    message = data.get("message")
+    if message is None:
         raise ValueError("Le champ 'message' est requis")
-    
-    titre = data["titre"]
-    message = data["message"]
-    
-    # Priorité (optionnel, défaut: NORMALE)
-    priorite_str = data.get("priorite", "NORMALE")
-    priorite = valider_priorite(priorite_str)
+
+    # Priorité (optionnel, défaut: NORMALE sans passer par le validateur)
+    priorite_str = data.get("priorite")
+    priorite = _P_NORMALE if priorite_str is None else valider_priorite(priorite_str)
     
     return notif.Urgence(
         type=type_urgence,
@@ -284,6 +403,16 @@ def creer_urgence_depuis_json(type_urgence: notif.TypeUrgence, data: Dict[str, A
 
 # ==================== PROCESSOR POUR LES FILES D'ATTENTE ====================
 
+# Correspondance type de tâche -> TypeUrgence, construite une seule fois
+# à l'import au lieu d'un dict de 4 entrées alloué par tâche traitée
+_TYPE_MAPPING = {
+    "meteo": notif.TypeUrgence.METEO,
+    "securite": notif.TypeUrgence.SECURITE,
+    "sante": notif.TypeUrgence.SANTE,
+    "infra": notif.TypeUrgence.INFRA
+}
+
+
 def process_notification_task(task_type: str, data: Dict[str, Any]) -> Dict[str, Any]:
     """
     Traite une tâche de notification.
@@ -291,14 +420,7 @@ def process_notification_task(task_type: str, data: Dict[str, Any]) -> Dict[str,
     """
     try:
         # Créer les objets depuis les données
-        type_mapping = {
-            "meteo": notif.TypeUrgence.METEO,
-            "securite": notif.TypeUrgence.SECURITE,
-            "sante": notif.TypeUrgence.SANTE,
-            "infra": notif.TypeUrgence.INFRA
-        }
-        
-        type_urgence = type_mapping.get(task_type)
+        type_urgence = _TYPE_MAPPING.get(task_type)
         if not type_urgence:
             raise ValueError(f"Type de notification inconnu: {task_type}")
         
@@ -306,7 +428,7 @@ def process_notification_task(task_type: str, data: Dict[str, Any]) -> Dict[str,
         utilisateurs = creer_utilisateurs_depuis_json(data["utilisateurs"])
         
         # Envoyer la notification
-        notificateur = notificateurs[task_type]
+        notificateur = _get_notificateurs()[task_type]
         notificateur.envoyer(urgence, utilisateurs)
         
         return {
@@ -357,35 +479,76 @@ def internal_error(error):
 
 # ==================== ROUTE RACINE ====================
 
+# Page d'accueil immuable: encodée une seule fois à l'import comme les
+# corps de /api/health et /api/notifications/types
+_INDEX_BODY = json.dumps({
+    "success": True,
+    "service": "Système de notification d'urgence",
+    "version": "1.0.0",
+    "description": "API RESTful pour la gestion des notifications d'urgence",
+    "endpoints": {
+        "health": "/api/health",
+        "types": "/api/notifications/types",
+        "meteo": "/api/notifications/meteo",
+        "securite": "/api/notifications/securite",
+        "sante": "/api/notifications/sante",
+        "infra": "/api/notifications/infra"
+    },
+    "interfaces": {
+        "admin": "/admin/",
+        "student": "/student/"
+    },
+    "documentation": {
+        "swagger_ui": "/api/docs",
+        "api_spec": "/api/apispec.json",
+        "description": "Documentation interactive Swagger/OpenAPI disponible à /api/docs"
+    }
+}, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
 @app.route('/', methods=['GET'])
 def index():
     """Page d'accueil avec informations sur l'API et liens vers les interfaces."""
-    return jsonify({
-        "success": True,
-        "service": "Système de notification d'urgence",
-        "version": "1.0.0",
-        "description": "API RESTful pour la gestion des notifications d'urgence",
-        "endpoints": {
-            "health": "/api/health",
-            "types": "/api/notifications/types",
-            "meteo": "/api/notifications/meteo",
-            "securite": "/api/notifications/securite",
-            "sante": "/api/notifications/sante",
-            "infra": "/api/notifications/infra"
+    return Response(_INDEX_BODY, mimetype="application/json")
+
+
+# ==================== ENDPOINTS API RESTful ====================
+
+# Corps JSON statiques encodés une seule fois à l'import: ces endpoints
+# renvoient toujours exactement la même charge utile, inutile de
+# reconstruire le dict et de le re-sérialiser à chaque requête
+_HEALTH_BODY = json.dumps({
+    "status": "healthy",
+    "service": "Système de notification d'urgence",
+    "version": "1.0.0"
+}, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+_TYPES_BODY = json.dumps({
+    "success": True,
+    "types": [
+        {
+            "type": "meteo",
+            "endpoint": "/api/notifications/meteo",
+            "description": "Notifications météorologiques avec calcul de zones à risque"
+        },
+        {
+            "type": "securite",
+            "endpoint": "/api/notifications/securite",
+            "description": "Notifications de sécurité avec gestion des urgences critiques"
         },
-        "interfaces": {
-            "admin": "/admin/",
-            "student": "/student/"
+        {
+            "type": "sante",
+            "endpoint": "/api/notifications/sante",
+            "description": "Notifications de santé avec confirmation requise"
         },
-        "documentation": {
-            "swagger_ui": "/api/docs",
-            "api_spec": "/api/apispec.json",
-            "description": "Documentation interactive Swagger/OpenAPI disponible à /api/docs"
+        {
+            "type": "infra",
+            "endpoint": "/api/notifications/infra",
+            "description": "Notifications d'infrastructure"
         }
-    }), 200
-
+    ]
+}, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
 
-# ==================== ENDPOINTS API RESTful ====================
 
 @app.route('/api/health', methods=['GET'])
 def health_check():
@@ -412,11 +575,129 @@ def health_check():
               type: string
               example: 1.0.0
     """
-    return jsonify({
-        "status": "healthy",
-        "service": "Système de notification d'urgence",
-        "version": "1.0.0"
-    }), 200
+    # Corps pré-encodé + en-tête de cache: les load balancers qui
+    # sondent la santé peuvent réutiliser la réponse quelques secondes
+    reponse = Response(_HEALTH_BODY, mimetype="application/json")
+    reponse.headers["Cache-Control"] = "public, max-age=5"
+    return reponse
+
+
+# Corps commun des quatre endpoints d'envoi: seuls la route, le
+# décorateur d'authentification et le message de succès diffèrent
+def _erreur_reponse(message: str, status: int = 400) -> Response:
+    """Construit une réponse d'erreur JSON à corps fixe, encodée une
+    seule fois à l'import (même approche que les corps statiques)."""
+    corps = json.dumps(
+        {"success": False, "error": message},
+        separators=(",", ":"), ensure_ascii=False
+    ).encode("utf-8")
+    return Response(corps, status=status, mimetype="application/json")
+
+
+_ERR_PAS_JSON = _erreur_reponse("Le contenu doit être au format JSON")
+_ERR_UTILISATEURS_REQUIS = _erreur_reponse("Le champ 'utilisateurs' (liste) est requis")
+_ERR_AUCUN_UTILISATEUR = _erreur_reponse("Au moins un utilisateur doit être fourni")
+
+_MESSAGES_ENVOI = {
+    "meteo": "Notification météorologique mise en file d'attente",
+    "securite": "Notification de sécurité mise en file d'attente",
+    "sante": "Notification de santé mise en file d'attente",
+    "infra": "Notification d'infrastructure mise en file d'attente",
+}
+
+
+# Gabarits d'octets pré-encodés par type: quatre des cinq champs de la
+# réponse 202 sont constants, seul le task_id (UUID, sans échappement à
+# prévoir) est inséré par formatage d'octets au lieu d'une
+# sérialisation JSON complète
+# Limitation de débit par type: une rafale qui dépasse le budget n'est
+# pas rejetée, sa tâche est différée d'autant (jetons par utilisateur
+# notifié). Les alertes de sécurité ne sont jamais différées.
+_LIMITEURS_ENVOI = {
+    "meteo": TokenBucket(rate=200.0, burst=1000),
+    "sante": TokenBucket(rate=200.0, burst=1000),
+    "infra": TokenBucket(rate=200.0, burst=1000),
+}
+
+_GABARITS_ENVOI = {
+    task_type: json.dumps({
+        "success": True,
+        "message": message,
+        "type": task_type,
+        "task_id": "%b",
+        "status": "pending",
+    }, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    for task_type, message in _MESSAGES_ENVOI.items()
+}
+
+# Taille des lots de destinataires par tâche de file d'attente (même
+# découpage que l'endpoint d'envoi admin): au-delà, le payload est
+# réparti sur plusieurs tâches pour que les deux workers se partagent
+# la livraison au lieu de traiter une tâche monolithique en série
+_TAILLE_LOT_ENVOI = 500
+
+
+def _traiter_envoi(task_type: str):
+    """Valide le JSON reçu, met la notification en file d'attente et
+    construit la réponse 202 (logique partagée des quatre endpoints)."""
+    try:
+        # Un seul appel: get_json(silent=True) renvoie None si le
+        # Content-Type n'est pas JSON ou si le corps est invalide
+        data = request.get_json(silent=True)
+        if data is None:
+            return _ERR_PAS_JSON
+
+        # Validation des données
+        utilisateurs = data.get("utilisateurs")
+        if not isinstance(utilisateurs, list):
+            return _ERR_UTILISATEURS_REQUIS
+
+        if not utilisateurs:
+            return _ERR_AUCUN_UTILISATEUR
+
+        # Ajouter à la file d'attente pour traitement asynchrone,
+        # différé si la rafale dépasse le budget du limiteur de débit
+        # (jetons réservés une seule fois pour l'ensemble du payload)
+        limiteur = _LIMITEURS_ENVOI.get(task_type)
+        delai = limiteur.reserve(len(utilisateurs)) if limiteur else 0.0
+
+        if len(utilisateurs) <= _TAILLE_LOT_ENVOI:
+            task_id = queue_manager.enqueue(task_type, data, delay=delai)
+            return Response(
+                _GABARITS_ENVOI[task_type] % task_id.encode("ascii"),
+                status=202,  # 202 Accepted pour traitement asynchrone
+                mimetype="application/json",
+            )
+
+        # Gros payload: découpage en lots comme côté admin, une tâche
+        # par lot pour que la livraison soit répartie entre les workers
+        task_ids = []
+        for debut in range(0, len(utilisateurs), _TAILLE_LOT_ENVOI):
+            lot = utilisateurs[debut:debut + _TAILLE_LOT_ENVOI]
+            task_ids.append(queue_manager.enqueue(
+                task_type, {**data, "utilisateurs": lot}, delay=delai))
+
+        return jsonify({
+            "success": True,
+            "message": _MESSAGES_ENVOI[task_type],
+            "type": task_type,
+            "task_id": task_ids[0],
+            "task_ids": task_ids,
+            "status": "pending",
+        }), 202
+
+    except ValueError as e:
+        return jsonify({
+            "success": False,
+            "error": "Erreur de validation",
+            "message": str(e)
+        }), 400
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "error": "Erreur lors de l'envoi de la notification",
+            "message": str(e)
+        }), 500
 
 
 @app.route('/api/notifications/meteo', methods=['POST'])
@@ -543,52 +824,7 @@ def envoyer_notification_meteo():
               type: string
               example: "Erreur lors de l'envoi de la notification"
     """
-    try:
-        # Vérifier que la requête contient du JSON
-        if not request.is_json:
-            return jsonify({
-                "success": False,
-                "error": "Le contenu doit être au format JSON"
-            }), 400
-        
-        data = request.get_json()
-        
-        # Validation des données
-        if "utilisateurs" not in data or not isinstance(data["utilisateurs"], list):
-            return jsonify({
-                "success": False,
-                "error": "Le champ 'utilisateurs' (liste) est requis"
-            }), 400
-        
-        if not data["utilisateurs"]:
-            return jsonify({
-                "success": False,
-                "error": "Au moins un utilisateur doit être fourni"
-            }), 400
-        
-        # Ajouter à la file d'attente pour traitement asynchrone
-        task_id = queue_manager.enqueue("meteo", data)
-        
-        return jsonify({
-            "success": True,
-            "message": "Notification météorologique mise en file d'attente",
-            "type": "meteo",
-            "task_id": task_id,
-            "status": "pending"
-        }), 202  # 202 Accepted pour traitement asynchrone
-        
-    except ValueError as e:
-        return jsonify({
-            "success": False,
-            "error": "Erreur de validation",
-            "message": str(e)
-        }), 400
-    except Exception as e:
-        return jsonify({
-            "success": False,
-            "error": "Erreur lors de l'envoi de la notification",
-            "message": str(e)
-        }), 500
+    return _traiter_envoi("meteo")
 
 
 @app.route('/api/notifications/securite', methods=['POST'])
@@ -662,50 +898,7 @@ def envoyer_notification_securite():
       500:
         description: Erreur serveur
     """
-    try:
-        if not request.is_json:
-            return jsonify({
-                "success": False,
-                "error": "Le contenu doit être au format JSON"
-            }), 400
-        
-        data = request.get_json()
-        
-        if "utilisateurs" not in data or not isinstance(data["utilisateurs"], list):
-            return jsonify({
-                "success": False,
-                "error": "Le champ 'utilisateurs' (liste) est requis"
-            }), 400
-        
-        if not data["utilisateurs"]:
-            return jsonify({
-                "success": False,
-                "error": "Au moins un utilisateur doit être fourni"
-            }), 400
-        
-        # Ajouter à la file d'attente pour traitement asynchrone
-        task_id = queue_manager.enqueue("securite", data)
-        
-        return jsonify({
-            "success": True,
-            "message": "Notification de sécurité mise en file d'attente",
-            "type": "securite",
-            "task_id": task_id,
-            "status": "pending"
-        }), 202
-        
-    except ValueError as e:
-        return jsonify({
-            "success": False,
-            "error": "Erreur de validation",
-            "message": str(e)
-        }), 400
-    except Exception as e:
-        return jsonify({
-            "success": False,
-            "error": "Erreur lors de l'envoi de la notification",
-            "message": str(e)
-        }), 500
+    return _traiter_envoi("securite")
 
 
 @app.route('/api/notifications/sante', methods=['POST'])
@@ -769,50 +962,7 @@ def envoyer_notification_sante():
       500:
         description: Erreur serveur
     """
-    try:
-        if not request.is_json:
-            return jsonify({
-                "success": False,
-                "error": "Le contenu doit être au format JSON"
-            }), 400
-        
-        data = request.get_json()
-        
-        if "utilisateurs" not in data or not isinstance(data["utilisateurs"], list):
-            return jsonify({
-                "success": False,
-                "error": "Le champ 'utilisateurs' (liste) est requis"
-            }), 400
-        
-        if not data["utilisateurs"]:
-            return jsonify({
-                "success": False,
-                "error": "Au moins un utilisateur doit être fourni"
-            }), 400
-        
-        # Ajouter à la file d'attente pour traitement asynchrone
-        task_id = queue_manager.enqueue("sante", data)
-        
-        return jsonify({
-            "success": True,
-            "message": "Notification de santé mise en file d'attente",
-            "type": "sante",
-            "task_id": task_id,
-            "status": "pending"
-        }), 202
-        
-    except ValueError as e:
-        return jsonify({
-            "success": False,
-            "error": "Erreur de validation",
-            "message": str(e)
-        }), 400
-    except Exception as e:
-        return jsonify({
-            "success": False,
-            "error": "Erreur lors de l'envoi de la notification",
-            "message": str(e)
-        }), 500
+    return _traiter_envoi("sante")
 
 
 @app.route('/api/notifications/infra', methods=['POST'])
@@ -876,50 +1026,7 @@ def envoyer_notification_infra():
       500:
         description: Erreur serveur
     """
-    try:
-        if not request.is_json:
-            return jsonify({
-                "success": False,
-                "error": "Le contenu doit être au format JSON"
-            }), 400
-        
-        data = request.get_json()
-        
-        if "utilisateurs" not in data or not isinstance(data["utilisateurs"], list):
-            return jsonify({
-                "success": False,
-                "error": "Le champ 'utilisateurs' (liste) est requis"
-            }), 400
-        
-        if not data["utilisateurs"]:
-            return jsonify({
-                "success": False,
-                "error": "Au moins un utilisateur doit être fourni"
-            }), 400
-        
-        # Ajouter à la file d'attente pour traitement asynchrone
-        task_id = queue_manager.enqueue("infra", data)
-        
-        return jsonify({
-            "success": True,
-            "message": "Notification d'infrastructure mise en file d'attente",
-            "type": "infra",
-            "task_id": task_id,
-            "status": "pending"
-        }), 202
-        
-    except ValueError as e:
-        return jsonify({
-            "success": False,
-            "error": "Erreur de validation",
-            "message": str(e)
-        }), 400
-    except Exception as e:
-        return jsonify({
-            "success": False,
-            "error": "Erreur lors de l'envoi de la notification",
-            "message": str(e)
-        }), 500
+    return _traiter_envoi("infra")
 
 
 @app.route('/api/queue/tasks/<task_id>', methods=['GET'])
@@ -1042,31 +1149,11 @@ def lister_types_notifications():
                     type: string
                     example: "Notifications météorologiques avec calcul de zones à risque"
     """
-    return jsonify({
-        "success": True,
-        "types": [
-            {
-                "type": "meteo",
-                "endpoint": "/api/notifications/meteo",
-                "description": "Notifications météorologiques avec calcul de zones à risque"
-            },
-            {
-                "type": "securite",
-                "endpoint": "/api/notifications/securite",
-                "description": "Notifications de sécurité avec gestion des urgences critiques"
-            },
-            {
-                "type": "sante",
-                "endpoint": "/api/notifications/sante",
-                "description": "Notifications de santé avec confirmation requise"
-            },
-            {
-                "type": "infra",
-                "endpoint": "/api/notifications/infra",
-                "description": "Notifications d'infrastructure"
-            }
-        ]
-    }), 200
+    # Métadonnées immuables tant que le code ne change pas: cachable
+    # longtemps côté client ou proxy
+    reponse = Response(_TYPES_BODY, mimetype="application/json")
+    reponse.headers["Cache-Control"] = "public, max-age=3600"
+    return reponse
 
 
 # ==================== POINT D'ENTRÉE ====================
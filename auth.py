@@ -17,11 +17,31 @@ ROLES = {
 }
 
 
+# Cache de la table des utilisateurs: les lectures (listing admin,
+# authentification par clé API) sont fréquentes, les écritures rares.
+# Chaque écriture incrémente _users_rev pour invalider le cache.
+_users_cache: Optional[Dict[str, Dict]] = None
+_users_cache_rev = -1
+_users_rev = 0
+
+
+def _invalidate_users_cache():
+    """Signale qu'une écriture a modifié la table des utilisateurs."""
+    global _users_rev
+    _users_rev += 1
+
+
 def load_users() -> Dict[str, Dict]:
     """Charge les utilisateurs depuis la base de données SQLite."""
+    global _users_cache, _users_cache_rev
+    if _users_cache is not None and _users_cache_rev == _users_rev:
+        return _users_cache
+
     users_list = fetch_all("SELECT * FROM users")
     # Convertir en format dict avec username comme clé (pour compatibilité)
-    return {user['username']: dict(user) for user in users_list}
+    _users_cache = {user['username']: dict(user) for user in users_list}
+    _users_cache_rev = _users_rev
+    return _users_cache
 
 
 def hash_password(password: str) -> str:
@@ -57,7 +77,8 @@ def create_user(username: str, password: str, role: str = "viewer", api_key: Opt
         INSERT INTO users (username, password_hash, role, api_key, active)
         VALUES (?, ?, ?, ?, ?)
     """, (username, hash_password(password), role, api_key, True))
-    
+    _invalidate_users_cache()
+
     # Récupérer l'utilisateur créé
     user = fetch_one("SELECT * FROM users WHERE username = ?", (username,))
     return dict(user) if user else {}
@@ -75,7 +96,8 @@ def authenticate_user(username: str, password: str) -> Optional[Dict]:
     
     # Mettre à jour la dernière connexion
     execute_query("UPDATE users SET last_login = CURRENT_TIMESTAMP WHERE id = ?", (user['id'],))
-    
+    _invalidate_users_cache()
+
     return dict(user)
 
 
@@ -142,6 +164,11 @@ def require_auth(f):
 
 def require_role(*allowed_roles):
     """Décorateur pour exiger un rôle spécifique."""
+    # Figé à la décoration: test d'appartenance O(1) et message d'erreur
+    # pré-assemblé au lieu d'une itération + jointure par requête
+    allowed_set = frozenset(allowed_roles)
+    roles_label = ', '.join(allowed_roles)
+
     def decorator(f):
         @wraps(f)
         def decorated_function(*args, **kwargs):
@@ -162,11 +189,11 @@ def require_role(*allowed_roles):
                     }), 401
             
             user_role = user.get('role', 'viewer')
-            if user_role not in allowed_roles:
+            if user_role not in allowed_set:
                 return jsonify({
                     "success": False,
                     "error": "Accès refusé",
-                    "message": f"Rôle requis: {', '.join(allowed_roles)}. Votre rôle: {user_role}"
+                    "message": f"Rôle requis: {roles_label}. Votre rôle: {user_role}"
                 }), 403
             
             return f(*args, **kwargs)
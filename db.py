@@ -4,40 +4,61 @@ Fournit les fonctions de connexion et d'interaction avec la base de données
 """
 import sqlite3
 import os
+import threading
 from contextlib import contextmanager
 from typing import List, Dict, Any, Optional, Tuple
 
 
 DATABASE_FILE = "notifications.db"
 
+# Une connexion SQLite par thread, réutilisée d'un appel à l'autre:
+# évite le coût connect + PRAGMAs à chaque requête, sans partage entre
+# threads (les connexions sqlite3 n'y sont pas prévues par défaut)
+_local = threading.local()
+
+
+def _get_thread_connection() -> sqlite3.Connection:
+    """Renvoie la connexion du thread courant, ouverte si nécessaire."""
+    conn = getattr(_local, "connection", None)
+    if conn is None:
+        conn = sqlite3.connect(DATABASE_FILE)
+        conn.row_factory = sqlite3.Row  # Permet d'accéder aux colonnes par nom
+
+        # Activer le mode WAL pour meilleure concurrence
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA foreign_keys=ON")  # Activer les contraintes FK
+        _local.connection = conn
+    return conn
+
+
+def close_thread_connection() -> None:
+    """Ferme la connexion du thread courant (avant suppression du fichier)."""
+    conn = getattr(_local, "connection", None)
+    if conn is not None:
+        conn.close()
+        _local.connection = None
+
 
 @contextmanager
 def get_db_connection():
     """
     Context manager pour obtenir une connexion à la base de données.
-    Gère automatiquement le commit/rollback et la fermeture.
+    Gère automatiquement le commit/rollback; la connexion reste ouverte
+    et est réutilisée par les appels suivants du même thread.
     
     Usage:
         with get_db_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("SELECT * FROM users")
     """
-    conn = sqlite3.connect(DATABASE_FILE)
-    conn.row_factory = sqlite3.Row  # Permet d'accéder aux colonnes par nom
-    
-    # Activer le mode WAL pour meilleure concurrence
-    conn.execute("PRAGMA journal_mode=WAL")
-    conn.execute("PRAGMA synchronous=NORMAL")
-    conn.execute("PRAGMA foreign_keys=ON")  # Activer les contraintes FK
-    
+    conn = _get_thread_connection()
     try:
         yield conn
         conn.commit()
     except Exception:
         conn.rollback()
         raise
-    finally:
-        conn.close()
 
 
 def execute_query(query: str, params: Tuple = ()) -> None:
@@ -121,6 +142,8 @@ def init_db(force: bool = False) -> None:
     """
     if force and os.path.exists(DATABASE_FILE):
         print(f"[DB] Suppression de l'ancienne base de données: {DATABASE_FILE}")
+        # Fermer la connexion du thread avant de supprimer le fichier
+        close_thread_connection()
         os.remove(DATABASE_FILE)
     
     migrations_file = os.path.join("migrations", "001_initial_schema.sql")
@@ -10,6 +10,9 @@ class PerformanceMetrics:
 
     def __init__(self) -> None:
         self._lock = threading.Lock()
+        # Révision monotone, incrémentée à chaque enregistrement: permet
+        # aux consommateurs de dater leurs caches sans TTL arbitraire.
+        self._rev = 0
         self._metrics: Dict[str, Dict[str, Any]] = {}
         self._global: Dict[str, Any] = {
             "total_notifications": 0,
@@ -20,8 +23,14 @@ class PerformanceMetrics:
             "last_notification": None,
         }
 
+    @property
+    def revision(self) -> int:
+        """Révision courante des métriques (monotone)."""
+        return self._rev
+
     def reset(self) -> None:
         with self._lock:
+            self._rev += 1
             self._metrics.clear()
             self._global.update(
                 total_notifications=0,
@@ -42,6 +51,7 @@ class PerformanceMetrics:
         """Enregistre l'exécution d'un notificateur."""
         timestamp = time.time()
         with self._lock:
+            self._rev += 1
             # Mise à jour globale
             self._global["total_notifications"] += 1
             self._global["total_duration"] += duration
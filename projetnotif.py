@@ -3,6 +3,7 @@ Système de notification d'urgence - Version simplifiée
 Tout dans un seul fichier pour faciliter la compréhension
 """
 from enum import IntEnum, Enum
+import logging
 import re
 import time
 from functools import wraps
@@ -18,9 +19,42 @@ except ImportError:
     notifications_logger = None
 
 
+logger = logging.getLogger(__name__)
+
 REGISTRY: Dict[str, Any] = {}
 CONFIG_SOURCE: Dict[str, Dict[str, Any]] = {}
 
+# Snapshot paresseux du registre (projection sérialisable pour le statut
+# système). Reconstruit uniquement après un nouvel enregistrement: sur un
+# système stable, c'est un simple retour de dict.
+_REGISTRY_SNAPSHOT: Any = None
+
+
+def _invalidate_registry_snapshot():
+    """Invalide le snapshot après un enregistrement dans REGISTRY."""
+    global _REGISTRY_SNAPSHOT
+    _REGISTRY_SNAPSHOT = None
+
+
+def get_registry_snapshot() -> Dict[str, Any]:
+    """Renvoie une projection stable du registre global.
+
+    Le même dict est réutilisé tant qu'aucune classe n'a été enregistrée
+    entre-temps; les appelants ne doivent pas le modifier.
+    """
+    global _REGISTRY_SNAPSHOT
+    if _REGISTRY_SNAPSHOT is None:
+        _REGISTRY_SNAPSHOT = {
+            "configs_actives": list(REGISTRY.get("configs", {}).keys()),
+            "canaux_disponibles": list(REGISTRY.get("channels", {}).keys()),
+            "templates_disponibles": list(REGISTRY.get("templates", {}).keys()),
+            "notificateurs_enregistres": len(REGISTRY.get("notificateurs", [])),
+            "types_notifications": [
+                cls.__name__ for cls in REGISTRY.get("notification_types", [])
+            ],
+        }
+    return _REGISTRY_SNAPSHOT
+
 
 # ==================== ÉNUMÉRATIONS ====================
 
@@ -165,6 +199,7 @@ class NotificationMeta(type):
         cls = super().__new__(mcls, name, bases, attrs)
         if name != "NotificationBase":
             REGISTRY.setdefault("notification_types", []).append(cls)
+            _invalidate_registry_snapshot()
         return cls
 
     @staticmethod
@@ -188,6 +223,7 @@ class ChannelMeta(type):
             if "livrer" not in attrs:
                 raise TypeError(f"Le canal {name} doit définir une méthode 'livrer'.")
             REGISTRY.setdefault("channels", {})[cls.channel_type] = cls
+            _invalidate_registry_snapshot()
         return cls
 
 
@@ -203,6 +239,7 @@ class TemplateMeta(type):
         cls = super().__new__(mcls, name, bases, attrs)
         if name != "BaseTemplate":
             REGISTRY.setdefault("templates", {})[cls.template_key] = cls
+            _invalidate_registry_snapshot()
         return cls
 
     @staticmethod
@@ -226,6 +263,7 @@ class ConfigMeta(type):
         attrs["defaults"] = defaults
         cls = super().__new__(mcls, name, bases, attrs)
         REGISTRY.setdefault("configs", {})[namespace] = cls
+        _invalidate_registry_snapshot()
         return cls
 
     def get_option(cls, key: str, default: Any = None) -> Any:
@@ -234,6 +272,10 @@ class ConfigMeta(type):
     def set_option(cls, key: str, value: Any):
         CONFIG_SOURCE.setdefault(cls.namespace, {})[key] = value
 
+    def set_options(cls, options: Dict[str, Any]):
+        """Applique plusieurs options en une seule passe."""
+        CONFIG_SOURCE.setdefault(cls.namespace, {}).update(options)
+
 
 class RetryConfig(metaclass=ConfigMeta):
     """Configuration globale du mécanisme de retry."""
@@ -249,6 +291,11 @@ class CircuitBreakerConfig(metaclass=ConfigMeta):
 
 class Utilisateur:
     """Représente un utilisateur (étudiant)."""
+    # Une instance par utilisateur et par requête: __slots__ supprime le
+    # __dict__ par instance (les descripteurs rangent leurs valeurs sous
+    # les noms soulignés, qui doivent donc figurer dans les slots)
+    __slots__ = ("_id", "nom", "_email", "langue", "_telephone", "_langue_preferee")
+
     id = StudentIdDescriptor()
     email = EmailDescriptor()
     telephone = PhoneDescriptor()
@@ -273,6 +320,8 @@ class Utilisateur:
 
 class Preferences:
     """Préférences d'un utilisateur."""
+    __slots__ = ("langue", "canal_prefere", "actif")
+
     def __init__(
         self,
         langue: Optional[Langue] = None,
@@ -286,6 +335,8 @@ class Preferences:
 
 class Message:
     """Message à livrer."""
+    __slots__ = ("charge", "priorite", "utilisateur")
+
     def __init__(self, charge: Dict, priorite: Priorite, utilisateur: Utilisateur):
         self.charge = charge
         self.priorite = priorite
@@ -400,6 +451,7 @@ def register_in_global_registry(cls):
     REGISTRY.setdefault("notificateurs", [])
     if cls not in REGISTRY["notificateurs"]:
         REGISTRY["notificateurs"].append(cls)
+        _invalidate_registry_snapshot()
         print(f"[REGISTRY] {cls.__name__} enregistré dans le registre global")
     return cls
 
@@ -578,6 +630,9 @@ class PreferencesStore:
     """Store des préférences utilisateur (singleton)."""
     _instance = None
     _prefs_shared = {}
+    # Version monotone des préférences, incrémentée à chaque sauvegarde;
+    # permet aux appelants de dater leurs propres caches.
+    _version = 0
     
     def __new__(cls):
         """Pattern singleton pour partager les préférences entre toutes les instances."""
@@ -598,9 +653,32 @@ class PreferencesStore:
         """Obtient les préférences d'un utilisateur."""
         return self._prefs.get(user_id)
 
+    def obtenir_plusieurs(self, user_ids) -> Dict[str, Preferences]:
+        """Obtient les préférences de plusieurs utilisateurs en un seul appel.
+
+        Renvoie un dict user_id -> Preferences ne contenant que les
+        utilisateurs ayant des préférences enregistrées.
+        """
+        prefs = self._prefs
+        return {uid: prefs[uid] for uid in user_ids if uid in prefs}
+
+    @property
+    def version(self) -> int:
+        """Version courante des préférences (monotone)."""
+        return PreferencesStore._version
+
     def sauvegarder(self, user_id: str, prefs: Preferences):
         """Sauvegarde les préférences."""
         self._prefs[user_id] = prefs
+        PreferencesStore._version += 1
+
+    def sauvegarder_plusieurs(self, prefs_par_user: Dict[str, Preferences]):
+        """Sauvegarde les préférences de plusieurs utilisateurs en une
+        seule opération (et une seule incrémentation de version)."""
+        if not prefs_par_user:
+            return
+        self._prefs.update(prefs_par_user)
+        PreferencesStore._version += 1
 
 
 class NotificationBase(metaclass=NotificationMeta):
@@ -618,13 +696,14 @@ class NotificationBase(metaclass=NotificationMeta):
         except AttributeError:
             target_lang = str(langue)
         
-        print(f"[DEBUG] Traduction - Texte: '{texte}', Source: {source_lang}, Cible: {target_lang}")
+        logger.debug("Traduction - Texte: '%s', Source: %s, Cible: %s",
+                     texte, source_lang, target_lang)
         resultat = translation_service.translate_text(
             texte,
             source_lang=source_lang,
             target_lang=target_lang
         )
-        print(f"[DEBUG] Traduction - Résultat: '{resultat}'")
+        logger.debug("Traduction - Résultat: '%s'", resultat)
         return resultat
 
     @log_action
@@ -639,36 +718,45 @@ class NotificationBase(metaclass=NotificationMeta):
         if isinstance(templates_registry, dict):
             template_cls = templates_registry.get(urgence.type.value) or templates_registry.get("default")
 
+        # Préférences chargées en bloc avant la boucle: un seul appel au
+        # store au lieu d'un obtenir() par utilisateur
+        prefs_map = self.prefs_store.obtenir_plusieurs([user.id for user in utilisateurs])
+
+        # Garde évaluée une seule fois: sans DEBUG, la boucle par
+        # utilisateur ne paie ni formatage ni écriture sur stdout
+        # (les print() précédents sérialisaient chaque ligne)
+        debug_actif = logger.isEnabledFor(logging.DEBUG)
+
         for user in utilisateurs:
-            prefs = self.prefs_store.obtenir(user.id)
-            print(f"[DEBUG] Utilisateur {user.id} - Préférences chargées: {prefs}")
-            if prefs:
-                print(f"[DEBUG] Préférences - Langue: {prefs.langue}, Canal: {prefs.canal_prefere}, Actif: {prefs.actif}")
+            prefs = prefs_map.get(user.id)
+            if debug_actif:
+                logger.debug("Utilisateur %s - Préférences chargées: %s", user.id, prefs)
+                if prefs:
+                    logger.debug("Préférences - Langue: %s, Canal: %s, Actif: %s",
+                                 prefs.langue, prefs.canal_prefere, prefs.actif)
             
             # Vérifier si l'utilisateur est actif
             # Si pas de préférences, considérer comme actif par défaut
             if prefs is not None and not prefs.actif:
-                print(f"[NOTIFICATION] Utilisateur {user.id} ({user.nom}) est inactif, notification ignorée")
+                logger.info("Utilisateur %s (%s) est inactif, notification ignorée",
+                            user.id, user.nom)
                 continue
 
             # Déterminer la langue (préférence > profil > langue déclarée)
             langue_utilisateur = user.langue
-            print(f"[DEBUG] Langue initiale (profil): {langue_utilisateur}")
             if prefs and prefs.langue:
                 langue_utilisateur = prefs.langue
-                print(f"[DEBUG] Langue depuis préférences: {langue_utilisateur}")
             elif user.langue_preferee:
                 try:
                     langue_utilisateur = Langue(user.langue_preferee)
-                    print(f"[DEBUG] Langue depuis langue_preferee: {langue_utilisateur}")
                 except ValueError:
                     langue_utilisateur = user.langue
-                    print(f"[DEBUG] Erreur conversion langue_preferee, utilisation profil: {langue_utilisateur}")
             
             # Extraire la valeur de la langue pour les logs et la traduction
             langue_value = langue_utilisateur.value if hasattr(langue_utilisateur, 'value') else str(langue_utilisateur)
-            print(f"[NOTIFICATION] Envoi à {user.id} ({user.nom}) - Langue préférée: {langue_value}")
-            print(f"[NOTIFICATION] Texte original - Titre: {urgence.titre}, Message: {urgence.message}")
+            if debug_actif:
+                logger.debug("Envoi à %s (%s) - Langue préférée: %s", user.id, user.nom, langue_value)
+                logger.debug("Texte original - Titre: %s, Message: %s", urgence.titre, urgence.message)
 
             # Préparer la charge utile avec traduction
             if template_cls:
@@ -685,7 +773,9 @@ class NotificationBase(metaclass=NotificationMeta):
                     "message": message_traduit
                 }
             
-            print(f"[NOTIFICATION] Texte traduit ({langue_value}) - Titre: {charge.get('titre', '')}, Message: {charge.get('message', '')}")
+            if debug_actif:
+                logger.debug("Texte traduit (%s) - Titre: %s, Message: %s",
+                             langue_value, charge.get('titre', ''), charge.get('message', ''))
 
             # Créer le message
             message = Message(charge=charge, priorite=urgence.priorite, utilisateur=user)
@@ -715,7 +805,7 @@ class NotificationBase(metaclass=NotificationMeta):
                         canal=canal_nom
                     )
                 except Exception as e:
-                    print(f"[NOTIFICATION] Erreur lors de l'enregistrement du log: {e}")
+                    logger.warning("Erreur lors de l'enregistrement du log: %s", e)
 
 
 @register_in_global_registry
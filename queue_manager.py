@@ -1,6 +1,8 @@
 """
 Module de gestion des files d'attente pour le traitement asynchrone des notifications
 """
+import heapq
+import itertools
 import queue
 import threading
 import time
@@ -11,6 +13,50 @@ from enum import Enum
 from dataclasses import dataclass, asdict
 
 
+class TokenBucket:
+    """Seau à jetons pour lisser les rafales d'envois.
+
+    reserve(n) consomme n jetons et renvoie le délai (en secondes) à
+    attendre avant de traiter la tâche: 0 si le seau contient assez de
+    jetons, sinon le temps nécessaire pour que le débit configuré les
+    reconstitue. Le solde peut devenir négatif, ce qui échelonne
+    naturellement les rafales successives au lieu de les rejeter.
+    """
+
+    def __init__(self, rate: float, burst: float):
+        self._rate = float(rate)
+        self._burst = float(burst)
+        self._tokens = float(burst)
+        self._last_refill = time.time()
+        self._lock = threading.Lock()
+
+    def reserve(self, n: int) -> float:
+        """Consomme n jetons et renvoie le délai d'attente en secondes."""
+        with self._lock:
+            now = time.time()
+            self._tokens = min(
+                self._burst,
+                self._tokens + (now - self._last_refill) * self._rate
+            )
+            self._last_refill = now
+            self._tokens -= n
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self._rate
+
+
+# Priorité de traitement par type de notification: les alertes de
+# sécurité et de santé passent devant les envois moins urgents quand la
+# file contient plusieurs tâches (FIFO conservé à priorité égale grâce
+# au numéro de séquence ajouté dans enqueue)
+_TYPE_PRIORITY = {
+    "securite": 0,
+    "sante": 1,
+    "infra": 2,
+    "meteo": 3,
+}
+
+
 class TaskStatus(Enum):
     """Statut d'une tâche."""
     PENDING = "pending"
@@ -31,6 +77,9 @@ class NotificationTask:
     completed_at: Optional[float] = None
     error: Optional[str] = None
     result: Optional[Dict[str, Any]] = None
+    # Horodatage avant lequel la tâche ne doit pas être traitée
+    # (renseigné par le limiteur de débit à l'enqueue)
+    not_before: Optional[float] = None
     
     def to_dict(self) -> Dict[str, Any]:
         """Convertit la tâche en dictionnaire pour JSON."""
@@ -54,7 +103,14 @@ class QueueManager:
         Args:
             num_workers: Nombre de workers pour traiter les tâches
         """
-        self._queue = queue.Queue()
+        self._queue = queue.PriorityQueue()
+        self._seq = itertools.count()
+        # Tas des tâches différées par le limiteur de débit, trié par
+        # échéance (not_before, priorité, séquence, id). Tenues hors de
+        # la PriorityQueue pour qu'une tâche non éligible ne bloque pas
+        # les tâches prêtes derrière elle; réinjectées à échéance.
+        self._deferred: List[tuple] = []
+        self._deferred_lock = threading.Lock()
         self._tasks: Dict[str, NotificationTask] = {}
         self._tasks_lock = threading.Lock()
         self._num_workers = num_workers
@@ -70,6 +126,16 @@ class QueueManager:
             "total_failed": 0,
             "current_queue_size": 0
         }
+
+        # Compteur de révision monotone: incrémenté à chaque changement
+        # d'état visible (enqueue, transition de statut, nettoyage). Sert
+        # d'ETag bon marché aux endpoints qui listent les tâches.
+        self._rev = 0
+
+    @property
+    def revision(self) -> int:
+        """Révision courante de l'état de la file (monotone)."""
+        return self._rev
     
     def set_processor(self, processor: Callable):
         """
@@ -113,32 +179,38 @@ class QueueManager:
         
         self._workers.clear()
     
-    def enqueue(self, task_type: str, data: Dict[str, Any]) -> str:
+    def enqueue(self, task_type: str, data: Dict[str, Any], delay: float = 0.0) -> str:
         """
         Ajoute une tâche à la file d'attente.
         
         Args:
             task_type: Type de notification (meteo, securite, etc.)
             data: Données de la notification
+            delay: Délai en secondes avant que la tâche soit éligible
+                au traitement (utilisé par la limitation de débit)
             
         Returns:
             ID de la tâche créée
         """
         task_id = str(uuid.uuid4())
+        created_at = time.time()
         task = NotificationTask(
             id=task_id,
             type=task_type,
             data=data,
             status=TaskStatus.PENDING,
-            created_at=time.time()
+            created_at=created_at,
+            not_before=created_at + delay if delay > 0 else None
         )
         
         with self._tasks_lock:
             self._tasks[task_id] = task
             self._stats["total_enqueued"] += 1
             self._stats["current_queue_size"] += 1
+            self._rev += 1
         
-        self._queue.put(task_id)
+        priority = _TYPE_PRIORITY.get(task_type, 3)
+        self._queue.put((priority, next(self._seq), task_id))
         return task_id
     
     def get_task(self, task_id: str) -> Optional[NotificationTask]:
@@ -164,7 +236,7 @@ class QueueManager:
             
             return {
                 **self._stats,
-                "current_queue_size": self._queue.qsize(),
+                "current_queue_size": self._queue.qsize() + len(self._deferred),
                 "tasks_by_status": {
                     "pending": pending,
                     "processing": processing,
@@ -189,26 +261,58 @@ class QueueManager:
             
             for task_id in to_remove:
                 del self._tasks[task_id]
+            if to_remove:
+                self._rev += 1
         
         return len(to_remove)
     
+    def _reinjecter_echues(self):
+        """Réinjecte en file les tâches différées arrivées à échéance."""
+        now = time.time()
+        with self._deferred_lock:
+            deferred = self._deferred
+            while deferred and deferred[0][0] <= now:
+                _, priority, seq, task_id = heapq.heappop(deferred)
+                self._queue.put((priority, seq, task_id))
+
     def _worker_loop(self):
         """Boucle principale d'un worker."""
         while not self._stop_event.is_set():
             try:
-                # Attendre une tâche avec timeout pour pouvoir vérifier stop_event
+                self._reinjecter_echues()
+
+                # Attendre une tâche avec timeout pour pouvoir vérifier
+                # stop_event (et repasser sur les tâches différées)
                 try:
-                    task_id = self._queue.get(timeout=1.0)
+                    entry = self._queue.get(timeout=1.0)
                 except queue.Empty:
                     continue
+                task_id = entry[2]
                 
                 # Récupérer la tâche
                 with self._tasks_lock:
                     task = self._tasks.get(task_id)
-                    if not task:
-                        continue
+                if not task:
+                    self._queue.task_done()
+                    continue
+
+                # Tâche différée par le limiteur de débit et pas encore
+                # éligible: la garder dans le tas des différées plutôt
+                # que la remettre en tête de file, où elle bloquerait
+                # les tâches prêtes derrière elle. Le worker enchaîne
+                # immédiatement sur la tâche éligible suivante.
+                if task.not_before is not None and task.not_before > time.time():
+                    with self._deferred_lock:
+                        heapq.heappush(
+                            self._deferred,
+                            (task.not_before, entry[0], entry[1], task_id))
+                    self._queue.task_done()
+                    continue
+
+                with self._tasks_lock:
                     task.status = TaskStatus.PROCESSING
                     task.started_at = time.time()
+                    self._rev += 1
                 
                 # Traiter la tâche
                 try:
@@ -220,6 +324,7 @@ class QueueManager:
                         task.result = result
                         self._stats["total_processed"] += 1
                         self._stats["current_queue_size"] -= 1
+                        self._rev += 1
                 
                 except Exception as e:
                     with self._tasks_lock:
@@ -228,6 +333,7 @@ class QueueManager:
                         task.error = str(e)
                         self._stats["total_failed"] += 1
                         self._stats["current_queue_size"] -= 1
+                        self._rev += 1
                 
                 finally:
                     self._queue.task_done()
@@ -53,7 +53,55 @@ class StudentsManager:
     
     def __init__(self):
         self._students: Dict[str, Student] = {}
+        # Index inversés pour filter_students: id d'étudiants par faculté,
+        # par promotion, et ensemble des actifs. Maintenus à chaque
+        # mutation pour filtrer par intersections d'ensembles au lieu de
+        # requêter SQLite à chaque envoi.
+        self._by_faculte: Dict[str, set] = {}
+        self._by_promotion: Dict[str, set] = {}
+        self._active_ids: set = set()
+        # Liste pré-filtrée de tous les actifs (cas le plus fréquent:
+        # diffusion sans critère). Invalidée à chaque mutation.
+        self._all_active_cache: Optional[List[Student]] = None
+        # Compteur de version monotone, incrémenté à chaque mutation;
+        # permet aux appelants de dater leurs propres caches.
+        self._version = 0
         self._load_students()
+        self._rebuild_indexes()
+
+    @property
+    def version(self) -> int:
+        """Version courante des données étudiants (monotone)."""
+        return self._version
+
+    def _index_student(self, student: Student):
+        """Ajoute un étudiant aux index inversés."""
+        self._all_active_cache = None
+        self._version += 1
+        if student.faculte:
+            self._by_faculte.setdefault(student.faculte, set()).add(student.id)
+        if student.promotion:
+            self._by_promotion.setdefault(student.promotion, set()).add(student.id)
+        if student.actif:
+            self._active_ids.add(student.id)
+
+    def _deindex_student(self, student: Student):
+        """Retire un étudiant des index inversés."""
+        self._all_active_cache = None
+        self._version += 1
+        if student.faculte:
+            self._by_faculte.get(student.faculte, set()).discard(student.id)
+        if student.promotion:
+            self._by_promotion.get(student.promotion, set()).discard(student.id)
+        self._active_ids.discard(student.id)
+
+    def _rebuild_indexes(self):
+        """Reconstruit tous les index depuis self._students."""
+        self._by_faculte.clear()
+        self._by_promotion.clear()
+        self._active_ids.clear()
+        for student in self._students.values():
+            self._index_student(student)
     
     def _load_students(self):
         """Charge les étudiants depuis la base de données SQLite."""
@@ -114,14 +162,16 @@ class StudentsManager:
             student.canal_prefere, student.actif
         ))
         self._students[student.id] = student
-    
+        self._index_student(student)
+
     def update_student(self, student_id: str, **kwargs):
         """Met à jour un étudiant."""
         if student_id not in self._students:
             raise ValueError(f"Étudiant {student_id} non trouvé")
-        
+
         student = self._students[student_id]
-        
+        self._deindex_student(student)
+
         # Construire la requête UPDATE dynamiquement
         set_clauses = []
         params = []
@@ -130,18 +180,20 @@ class StudentsManager:
                 setattr(student, key, value)
                 set_clauses.append(f"{key} = ?")
                 params.append(value)
-        
+
         if set_clauses:
             params.append(student_id)
             query = f"UPDATE students SET {', '.join(set_clauses)} WHERE id = ?"
             execute_query(query, tuple(params))
-        
+
+        self._index_student(student)
         return student
-    
+
     def delete_student(self, student_id: str):
         """Supprime un étudiant."""
         execute_query("DELETE FROM students WHERE id = ?", (student_id,))
         if student_id in self._students:
+            self._deindex_student(self._students[student_id])
             del self._students[student_id]
     
     def filter_students(
@@ -151,35 +203,42 @@ class StudentsManager:
         actif_only: bool = True
     ) -> List[Student]:
         """
-        Filtre les étudiants selon les critères en utilisant SQL.
-        
+        Filtre les étudiants via les index inversés en mémoire.
+
         Args:
             facultes: Liste des facultés à inclure (None = toutes)
             promotions: Liste des promotions à inclure (None = toutes)
             actif_only: Ne retourner que les étudiants actifs
-        
+
         Returns:
             Liste des étudiants correspondant aux critères
         """
-        # Construire la requête SQL dynamiquement
-        query = "SELECT * FROM students WHERE 1=1"
-        params = []
-        
-        if actif_only:
-            query += " AND actif = 1"
-        
+        # Diffusion sans critère: réutiliser la liste des actifs déjà
+        # construite (ne pas la modifier côté appelant)
+        if actif_only and not facultes and not promotions:
+            if self._all_active_cache is None:
+                students = self._students
+                self._all_active_cache = [students[sid] for sid in self._active_ids]
+            return self._all_active_cache
+
+        # Intersections d'ensembles d'ids: O(|sélection|) au lieu d'une
+        # requête SQL + reconstruction des objets Student à chaque appel
+        ids = set(self._active_ids) if actif_only else set(self._students)
+
         if facultes:
-            placeholders = ','.join(['?' for _ in facultes])
-            query += f" AND faculte IN ({placeholders})"
-            params.extend(facultes)
-        
+            selection = set()
+            for faculte in facultes:
+                selection |= self._by_faculte.get(faculte, set())
+            ids &= selection
+
         if promotions:
-            placeholders = ','.join(['?' for _ in promotions])
-            query += f" AND promotion IN ({placeholders})"
-            params.extend(promotions)
-        
-        results = fetch_all(query, tuple(params))
-        return [Student.from_dict(dict(row)) for row in results]
+            selection = set()
+            for promotion in promotions:
+                selection |= self._by_promotion.get(promotion, set())
+            ids &= selection
+
+        students = self._students
+        return [students[student_id] for student_id in ids]
     
     def get_faculties(self) -> List[str]:
         """Retourne la liste des facultés."""